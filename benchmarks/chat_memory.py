@@ -0,0 +1,90 @@
+"""Benchmark: open-chat prompt size with bounded conversational memory.
+
+Runs a long chat through run_qa on the fixture backend (no API key needed),
+with the response cache off so every turn is a real qa_crew kickoff. For
+each turn it records the history tokens sent with the question, the
+qa_crew prompt tokens, and what the history would have cost if the whole
+chat were passed verbatim. Background summaries are awaited between turns,
+as a user's reading time would allow.
+
+    python benchmarks/chat_memory.py --turns 30
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("BUKID_LLM_BACKEND", "fixture")
+os.environ["BUKID_CACHE_DISABLED"] = "1"
+
+from bukid import metrics
+from bukid.conversation import NO_HISTORY, Turn, chat_memory
+from bukid.crew import run_qa
+from bukid.llm import estimate_tokens
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "chat_memory.json"
+CREW_INPUTS = {"location": "Quezon City", "language": "English", "planting_medium": "pots", "previous_year": "2025"}
+QUESTIONS = [
+    "How often should I water tomatoes in pots?",
+    "What about in the rainy season?",
+    "Which fertilizer is best for them?",
+    "My pechay leaves have small holes, what should I do?",
+    "Is that spray safe for kangkong too?",
+    "When can I plant garlic here?",
+    "And onions?",
+    "How deep should the pots be for eggplant?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    memory = chat_memory()
+    naive: list[Turn] = []
+    rows = []
+    for turn in range(1, args.turns + 1):
+        question = QUESTIONS[(turn - 1) % len(QUESTIONS)]
+        prompt_before = metrics.PROMPT_TOKENS.value(crew="qa_crew")
+        answer = run_qa(CREW_INPUTS, question, memory=memory)
+        naive_history = "\n\n".join(t.render() for t in naive) or NO_HISTORY
+        rows.append({
+            "turn": turn,
+            "history_tokens": memory.context_tokens[-1],
+            "naive_history_tokens": estimate_tokens(naive_history) if naive else 0,
+            "qa_prompt_tokens": int(metrics.PROMPT_TOKENS.value(crew="qa_crew") - prompt_before),
+        })
+        naive.append(Turn(question, answer))
+        if memory.summarizing is not None:
+            memory.summarizing[0].result()
+
+    budget = memory.token_budget
+    report = {
+        "benchmark": "chat_memory",
+        "turns": args.turns,
+        "max_verbatim_turns": memory.max_turns,
+        "token_budget": budget,
+        "within_budget": all(row["history_tokens"] <= budget for row in rows),
+        "max_history_tokens": max(row["history_tokens"] for row in rows),
+        "final_naive_history_tokens": rows[-1]["naive_history_tokens"],
+        "max_qa_prompt_tokens": max(row["qa_prompt_tokens"] for row in rows),
+        "memory": memory.stats(),
+        "per_turn": rows,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{'turn':>4} {'history':>8} {'naive':>8} {'qa prompt':>10}")
+    for row in rows:
+        print(f"{row['turn']:>4} {row['history_tokens']:>8} {row['naive_history_tokens']:>8} {row['qa_prompt_tokens']:>10}")
+    print(f"\nbudget {budget} tokens, within budget: {report['within_budget']}, "
+          f"folded turns: {memory.folded}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
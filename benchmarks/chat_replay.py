@@ -0,0 +1,115 @@
+"""Benchmark: rerun time of main.py with a long chat history.
+
+Every Streamlit rerun replays the whole chat history, rebuilding the schedule
+Gantt chart, summary table and card payloads for each result in it. This runs
+the planning flow on the fixture backend (no API key needed), pads its
+history with open-chat turns until it is --messages long, then times reruns with chart.py's render
+memo off (BUKID_CHART_CACHE_MAX_ENTRIES=0), cold and warm.
+
+    python benchmarks/chat_replay.py --messages 200 --reruns 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["BUKID_LLM_BACKEND"] = "fixture"
+# Draw the whole history, so every rerun goes through the charts being measured
+os.environ["BUKID_CHAT_HISTORY_WINDOW"] = "0"
+
+from e2e_latency import ROOT, SCRIPT_RUNS, FlowRecorder, git_revision, planning_flow
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "chat_replay.json"
+# chart.py builders the planning flow's history goes through
+BUILDERS = ("schedule_cards", "gantt_figure", "summary_table", "preparation_cards", "research_cards")
+
+
+def time_reruns(at, reruns: int, before_each=None) -> list[float]:
+    """Script time of each rerun, in seconds."""
+    times = []
+    for _ in range(reruns):
+        if before_each is not None:
+            before_each()
+        SCRIPT_RUNS.clear()
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"Rerun raised: {at.exception[0].value}")
+        times.append(sum(SCRIPT_RUNS))
+    return times
+
+
+def summarize(times: list[float]) -> dict:
+    return {
+        "reruns": len(times),
+        "median_s": round(statistics.median(times), 4),
+        "min_s": round(min(times), 4),
+        "max_s": round(max(times), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200, help="chat history length to replay")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per rerun")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    # Mirror `streamlit run main.py`, which puts the script directory on sys.path
+    sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ["BUKID_CACHE_PATH"] = os.path.join(tmpdir.name, "replay.sqlite3")
+    recorder = FlowRecorder(timeout=args.timeout, quiet=True, trace_memory=False)
+    planning_flow(recorder)
+    at = recorder.at
+
+    flow_messages = list(at.session_state["messages"])
+    # Each result is shown once per chat, so repeat the closing QA exchange
+    chat_turn = flow_messages[-2:]
+    padding = chat_turn * max(0, (args.messages - len(flow_messages) + 1) // 2)
+    messages = (flow_messages + padding)[: max(args.messages, len(flow_messages))]
+    at.session_state["messages"] = messages
+    sentinels = sum(m["content"].startswith("__") for m in messages)
+
+    # main.py imported chart into this process through AppTest
+    chart = sys.modules["chart"]
+    from bukid import metrics
+
+    os.environ["BUKID_CHART_CACHE_MAX_ENTRIES"] = "0"
+    unmemoized = time_reruns(at, args.reruns)
+    os.environ.pop("BUKID_CHART_CACHE_MAX_ENTRIES")
+    cold = time_reruns(at, args.reruns, before_each=chart.clear_chart_cache)
+    hits_before = sum(metrics.CHART_BUILDS.value(kind=kind, outcome="hit") for kind in BUILDERS)
+    warm = time_reruns(at, args.reruns)
+    hits = sum(metrics.CHART_BUILDS.value(kind=kind, outcome="hit") for kind in BUILDERS)
+    tmpdir.cleanup()
+
+    report = {
+        "benchmark": "chat_replay",
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "messages": len(messages),
+        "result_sentinels": sentinels,
+        "unmemoized": summarize(unmemoized),
+        "memoized_cold": summarize(cold),
+        "memoized_warm": summarize(warm),
+        "warm_memo_hits_per_rerun": int((hits - hits_before) / args.reruns),
+        "speedup_warm": round(statistics.median(unmemoized) / statistics.median(warm), 2),
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{len(messages)} messages, {sentinels} rendered results")
+    for name in ("unmemoized", "memoized_cold", "memoized_warm"):
+        print(f"{name:>14}: median {report[name]['median_s'] * 1000:8.1f} ms per rerun")
+    print(f"warm speedup {report['speedup_warm']}x")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Micro-benchmark: per-call crew setup overhead.
+
+Compares building a crew the old way (a fresh Bukid() per call, which re-reads
+the YAML configs and rebuilds every agent/task) against a copy handed out by
+the process-wide crew factory. No kickoff happens, so no LLM calls are made.
+
+    python benchmarks/crew_setup.py --iterations 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bukid.crew import CREW_NAMES, Bukid, crew_factory
+
+
+def time_calls(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    crew_factory.warm()
+
+    print(f"{'crew':<18} {'Bukid() ms':>12} {'factory ms':>12} {'speedup':>9}")
+    for crew_name in CREW_NAMES:
+        before = time_calls(lambda: getattr(Bukid(), crew_name)(), args.iterations)
+        after = time_calls(lambda: crew_factory.get(crew_name), args.iterations)
+        before_ms, after_ms = statistics.median(before), statistics.median(after)
+        print(f"{crew_name:<18} {before_ms:>12.2f} {after_ms:>12.2f} {before_ms / after_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
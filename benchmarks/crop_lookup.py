@@ -0,0 +1,124 @@
+"""Benchmark: crop name lookups against the crop catalog.
+
+Times bukid.crops lookups (exact alias, alias inside a longer name, typo,
+unknown name) with the response-level lru_cache bypassed, against the
+linear substring scan chart.py and the garden designer used before. Runs on
+the bundled catalog and on a copy padded with --varieties synthetic seed
+varieties, to show lookup time stays flat as the catalog grows.
+
+    python benchmarks/crop_lookup.py --varieties 5000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bukid.crops import CATALOG_PATH, CropCatalog, normalize_crop_name
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "crop_lookup.json"
+QUERIES = {
+    "exact": ["Tomato", "Kangkong", "Sitaw", "Eggplant", "Pechay", "Ampalaya"],
+    "in_longer_name": ["Kangkong (Water Spinach)", "Siling Labuyo (Bird's Eye Chili)", "String Beans (Sitaw)",
+                       "Sweet Potato Tops", "Chinese Cabbage (Pechay Baguio)", "Eggplant (Talong)"],
+    "typo": ["Ampalya", "Malungay", "Tomatoe", "Kalabsa", "Egplant", "Sigarilyas"],
+    "unknown": ["Dragon fruit", "Mangosteen", "Rambutan", "Durian", "Lanzones", "Santol"],
+}
+WORDS = ["Golden", "Sunrise", "Emerald", "Ruby", "Star", "Max", "Royal", "Jade", "Pearl", "Giant",
+         "Early", "Supreme", "Prime", "Glory", "Magic", "Crown", "Sakura", "Bonanza", "Victory", "Rio"]
+
+
+def padded_catalog(varieties: int, directory: str) -> Path:
+    """The bundled catalog plus synthetic varieties spread over its crops."""
+    data = json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
+    rng = random.Random(0)
+    for i in range(varieties):
+        crop = data["crops"][i % len(data["crops"])]
+        crop.setdefault("varieties", []).append(f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i:04d}")
+    path = Path(directory) / f"crops_{varieties}.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def linear_table(path: Path) -> dict[str, str]:
+    """alias -> crop ID, as the flat dicts scanned by the old lookups."""
+    table = {}
+    for crop in json.loads(path.read_text(encoding="utf-8"))["crops"]:
+        for name in [crop["name"], crop["tagalog"], *crop.get("aliases", []), *crop.get("varieties", [])]:
+            table.setdefault(name.lower(), crop["id"])
+    return table
+
+
+def linear_lookup(table: dict[str, str], name: str):
+    """The previous approach: exact key, then the first key the name contains or is contained in."""
+    key = name.strip().lower()
+    if key in table:
+        return table[key]
+    for k, crop_id in table.items():
+        if k in key or key in k:
+            return crop_id
+    return None
+
+
+def time_per_lookup(lookup, names: list[str], repeat: int) -> float:
+    """Median microseconds per lookup over repeat passes."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            lookup(name)
+        samples.append((time.perf_counter() - start) / len(names) * 1e6)
+    return round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--varieties", type=int, default=5000, help="synthetic varieties added to the padded catalog")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    catalogs = {"bundled": CATALOG_PATH, f"padded_{args.varieties}": padded_catalog(args.varieties, tmpdir.name)}
+    report = {"benchmark": "crop_lookup", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "catalogs": {}}
+    for label, path in catalogs.items():
+        start = time.perf_counter()
+        catalog = CropCatalog(path)
+        build_ms = (time.perf_counter() - start) * 1000
+        table = linear_table(path)
+        row = {**catalog.stats(), "build_ms": round(build_ms, 1), "lookup_us": {}}
+        for kind, names in QUERIES.items():
+            row["lookup_us"][kind] = {
+                "catalog": time_per_lookup(catalog.find, names, args.repeat),
+                "linear_scan": time_per_lookup(lambda name: linear_lookup(table, name), names, args.repeat),
+            }
+        report["catalogs"][label] = row
+    tmpdir.cleanup()
+
+    # Which crop each query resolves to, to check matches rather than just speed
+    catalog = CropCatalog(CATALOG_PATH)
+    report["matches"] = {
+        name: (catalog.find(name).id if catalog.find(name) else None)
+        for names in QUERIES.values() for name in names
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    for label, row in report["catalogs"].items():
+        print(f"{label}: {row['crops']} crops, {row['aliases']} aliases, built in {row['build_ms']} ms")
+        print(f"  {'query':<16} {'catalog':>10} {'linear scan':>12}")
+        for kind, times in row["lookup_us"].items():
+            print(f"  {kind:<16} {times['catalog']:>8.1f}us {times['linear_scan']:>10.1f}us")
+    unmatched = [name for name, crop in report["matches"].items() if crop is None]
+    print(f"unmatched: {', '.join(unmatched)}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
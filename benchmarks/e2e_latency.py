@@ -0,0 +1,204 @@
+"""End-to-end latency benchmark for the main.py chat flow.
+
+Drives the Streamlit script headlessly with AppTest against the fixture LLM
+backend (no network, no API key) through both branches:
+
+- planning: location → language → planning → research → schedule → preparation → QA
+- planted:  location → language → planted → harvest schedule → tracker → replanting
+
+For every step it records wall time, the number of script runs (reruns
+included), script execution time per run and peak memory (process max RSS,
+plus per-step traced Python allocations with --trace-memory), then writes
+everything to JSON so results can be diffed between commits.
+
+    python benchmarks/e2e_latency.py --latency 0.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MAIN = ROOT / "main.py"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "e2e_latency.json"
+
+# AppTest runs the script in this process, so a module-level list can collect
+# per-run timings from the wrapper script below.
+SCRIPT_RUNS: list[float] = []
+sys.modules.setdefault("bukid_e2e_probe", sys.modules[__name__])
+
+WRAPPER_SCRIPT = f"""
+import runpy, sys, time
+_probe = sys.modules["bukid_e2e_probe"]
+_start = time.perf_counter()
+try:
+    runpy.run_path({str(MAIN)!r}, run_name="__main__")
+finally:
+    _probe.SCRIPT_RUNS.append(time.perf_counter() - _start)
+"""
+
+
+class FlowRecorder:
+    """Runs one AppTest session and times each user-visible step."""
+
+    def __init__(self, timeout: float, quiet: bool, trace_memory: bool):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_string(WRAPPER_SCRIPT, default_timeout=timeout)
+        self.quiet = quiet
+        self.trace_memory = trace_memory
+        self.steps: list[dict] = []
+
+    def step(self, name: str, action=None):
+        """Apply an interaction (or the initial load) and rerun the script."""
+        SCRIPT_RUNS.clear()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        sink = io.StringIO() if self.quiet else None
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink) if sink else contextlib.nullcontext():
+            if action is not None:
+                action(self.at)
+            self.at.run()
+        wall = time.perf_counter() - start
+
+        if self.at.exception:
+            raise RuntimeError(f"Step '{name}' raised: {self.at.exception[0].value}")
+
+        runs = list(SCRIPT_RUNS)
+        result = {
+            "step": name,
+            "wall_s": round(wall, 4),
+            "reruns": len(runs),
+            "script_run_s": [round(r, 4) for r in runs],
+            # ru_maxrss is KiB on Linux
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        if self.trace_memory:
+            result["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1_048_576, 2)
+        self.steps.append(result)
+        return self.at
+
+
+def planning_flow(recorder: FlowRecorder):
+    r = recorder
+    r.step("load")
+    r.step("location", lambda at: (at.text_input[0].input("Calamba, Laguna"), at.button[0].click()))
+    r.step("language", lambda at: at.button(key="lang_en").click())
+    r.step("mode_planning", lambda at: at.button(key="mode_planning").click())
+    r.step("medium_and_research", lambda at: at.button(key="med_pots").click())
+    r.step("confirm_vegetables", lambda at: next(
+        b for b in at.button if b.label.startswith("✅ Done")
+    ).click())
+    r.step("skip_designer", lambda at: at.button(key="design_no").click())
+    r.step("schedule", lambda at: at.button(key="schedule_yes").click())
+    r.step("preparation", lambda at: at.button(key="prep_yes").click())
+    r.step("qa", lambda at: at.chat_input[0].set_value("How often should I water my pots?"))
+
+
+def planted_flow(recorder: FlowRecorder):
+    r = recorder
+    r.step("load")
+    r.step("location", lambda at: (at.text_input[0].input("Calamba, Laguna"), at.button[0].click()))
+    r.step("language", lambda at: at.button(key="lang_en").click())
+    r.step("mode_planted", lambda at: at.button(key="mode_planted").click())
+    r.step("choose_harvest", lambda at: at.button(key="ap_harvest").click())
+    r.step("planted_vegetables", lambda at: (
+        at.text_area[0].input("Kangkong, Okra, Pechay"), at.button[0].click()
+    ))
+    r.step("schedule", lambda at: at.button(key="ap_sched_yes").click())
+    r.step("tracker", lambda at: next(
+        b for b in at.button if "Save planting dates" in b.label
+    ).click())
+    r.step("replanting", lambda at: next(
+        b for b in at.button if "replanting suggestions" in b.label
+    ).click())
+
+
+FLOWS = {"planning": planning_flow, "planted": planted_flow}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", nargs="+", choices=sorted(FLOWS), default=sorted(FLOWS))
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="artificial fixture latency per LLM call, in seconds")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="artificial fixture latency per streamed chunk, in seconds")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="reuse one response cache across flows instead of a fresh one per flow")
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per step")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record per-step peak Python allocations (slows imports considerably)")
+    parser.add_argument("--verbose", action="store_true", help="show crew output")
+    args = parser.parse_args()
+
+    os.environ["BUKID_LLM_BACKEND"] = "fixture"
+    os.environ["BUKID_FIXTURE_LATENCY"] = str(args.latency)
+    os.environ["BUKID_FIXTURE_TOKEN_LATENCY"] = str(args.token_latency)
+
+    tmpdir = tempfile.TemporaryDirectory()
+    if args.trace_memory:
+        tracemalloc.start()
+    results = {}
+    for name in args.flows:
+        cache_name = "warm.sqlite3" if args.warm_cache else f"{name}.sqlite3"
+        os.environ["BUKID_CACHE_PATH"] = os.path.join(tmpdir.name, cache_name)
+        import bukid.cache
+        bukid.cache._cache = None  # pick up the per-flow cache path
+
+        recorder = FlowRecorder(timeout=args.timeout, quiet=not args.verbose, trace_memory=args.trace_memory)
+        start = time.perf_counter()
+        FLOWS[name](recorder)
+        results[name] = {
+            "total_wall_s": round(time.perf_counter() - start, 4),
+            "steps": recorder.steps,
+        }
+    if args.trace_memory:
+        tracemalloc.stop()
+    tmpdir.cleanup()
+
+    report = {
+        "benchmark": "e2e_latency",
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "fixture_latency_s": args.latency,
+        "fixture_token_latency_s": args.token_latency,
+        "warm_cache": args.warm_cache,
+        "flows": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    for name, flow in results.items():
+        print(f"\n{name}  (total {flow['total_wall_s']:.2f}s)")
+        print(f"  {'step':<22} {'wall s':>8} {'reruns':>7} {'max run s':>10} {'RSS MB':>8}")
+        for s in flow["steps"]:
+            print(f"  {s['step']:<22} {s['wall_s']:>8.3f} {s['reruns']:>7} "
+                  f"{max(s['script_run_s'], default=0):>10.3f} {s['max_rss_mb']:>8.1f}")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    # Mirror `streamlit run main.py`, which puts the script directory on sys.path
+    sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+    main()
@@ -0,0 +1,170 @@
+"""Benchmark: per-interaction script time, full-app rerun vs fragment-scoped rerun.
+
+main.py runs the active step and the open chat as st.fragment units, so an
+interaction reruns only its own fragment instead of the gating, the history
+replay and every branch check. This drives main.py with AppTest on the
+fixture backend (no API key needed), pads the chat history to --messages,
+and times the same interactions both ways:
+
+- add_vegetable: adding a vegetable to the researched list (active_step)
+- qa:            asking an open-chat question (open_chat)
+
+AppTest always starts a full run, so fragment-scoped reruns are started the
+way the browser does it, by putting the fragment on the rerun request.
+
+    python benchmarks/fragment_reruns.py --messages 200 --interactions 5
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["BUKID_LLM_BACKEND"] = "fixture"
+
+from e2e_latency import ROOT, FlowRecorder, git_revision
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "fragment_reruns.json"
+PADDING_TURN = [
+    {"role": "user", "content": "How often should I water my pechay in pots?"},
+    {"role": "assistant", "content": (
+        "Water pechay in pots every morning during the dry season, and check the soil "
+        "before watering in the rainy season: if the top 2 cm is still damp, skip a day. "
+        "Make sure the pots have drainage holes so the roots never sit in water."
+    )},
+]
+
+
+@contextlib.contextmanager
+def fragment_scoped(at, key: str):
+    """Make at.run() rerun only the fragment registered under key, as a widget in it would."""
+    from streamlit.testing.v1 import local_script_runner
+
+    fragment_ids = at._fragment_storage.resolve_target(key)
+    original = local_script_runner.RerunData
+    # Both the runner's initial request and the one at.run() makes are built from this
+    local_script_runner.RerunData = functools.partial(original, fragment_id_queue=list(fragment_ids))
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+
+def pad_history(at, messages: int):
+    """Pad the chat with open-chat turns, then redraw it all in one full run."""
+    history = list(at.session_state["messages"])
+    turns = max(0, messages - len(history)) // 2
+    at.session_state["messages"] = history + PADDING_TURN * turns
+    at.run()
+
+
+def timed(at, interact, count: int) -> list[float]:
+    times = []
+    for i in range(count):
+        interact(at, i)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"Interaction raised: {at.exception[0].value}")
+    return times
+
+
+def add_vegetable(at, i: int):
+    at.text_input[0].input(f"Vegetable {i}")
+    next(b for b in at.button if b.label.startswith("➕")).click()
+
+
+def ask(at, i: int):
+    at.chat_input[0].set_value(f"How deep should pot number {i} be for eggplant?")
+
+
+def summarize(times: list[float]) -> dict:
+    return {
+        "interactions": len(times),
+        "median_s": round(statistics.median(times), 4),
+        "min_s": round(min(times), 4),
+        "max_s": round(max(times), 4),
+    }
+
+
+def compare(args, reach, interact, fragment_key: str) -> dict:
+    """Median time of one interaction with a full-app rerun and with a fragment rerun."""
+    results = {}
+    for mode in ("full_rerun", "fragment_rerun"):
+        recorder = FlowRecorder(timeout=args.timeout, quiet=True, trace_memory=False)
+        reach(recorder)
+        at = recorder.at
+        pad_history(at, args.messages)
+        scope = fragment_scoped(at, fragment_key) if mode == "fragment_rerun" else contextlib.nullcontext()
+        with scope:
+            results[mode] = summarize(timed(at, interact, args.interactions))
+    results["speedup"] = round(results["full_rerun"]["median_s"] / results["fragment_rerun"]["median_s"], 2)
+    return results
+
+
+def reach_vegetable_list(r: FlowRecorder):
+    r.step("load")
+    r.step("location", lambda at: (at.text_input[0].input("Calamba, Laguna"), at.button[0].click()))
+    r.step("language", lambda at: at.button(key="lang_en").click())
+    r.step("mode_planning", lambda at: at.button(key="mode_planning").click())
+    r.step("medium_and_research", lambda at: at.button(key="med_pots").click())
+
+
+def reach_open_chat(r: FlowRecorder):
+    reach_vegetable_list(r)
+    r.step("confirm_vegetables", lambda at: next(
+        b for b in at.button if b.label.startswith("✅ Done")
+    ).click())
+    r.step("skip_designer", lambda at: at.button(key="design_no").click())
+    r.step("schedule", lambda at: at.button(key="schedule_yes").click())
+    r.step("preparation", lambda at: at.button(key="prep_yes").click())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200, help="chat history length")
+    parser.add_argument("--interactions", type=int, default=5, help="timed interactions per mode")
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per run")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    # Mirror `streamlit run main.py`, which puts the script directory on sys.path
+    sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ["BUKID_CACHE_PATH"] = os.path.join(tmpdir.name, "fragments.sqlite3")
+
+    scenarios = {
+        "add_vegetable": compare(args, reach_vegetable_list, add_vegetable, "active_step"),
+        "qa": compare(args, reach_open_chat, ask, "open_chat"),
+    }
+    tmpdir.cleanup()
+
+    report = {
+        "benchmark": "fragment_reruns",
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "messages": args.messages,
+        "scenarios": scenarios,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{args.messages} messages of history, median wall time per interaction")
+    print(f"{'interaction':<15} {'full rerun':>11} {'fragment':>9} {'speedup':>8}")
+    for name, result in scenarios.items():
+        print(f"{name:<15} {result['full_rerun']['median_s'] * 1000:9.1f}ms "
+              f"{result['fragment_rerun']['median_s'] * 1000:7.1f}ms {result['speedup']:7.2f}x")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
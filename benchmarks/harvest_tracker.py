@@ -0,0 +1,160 @@
+"""Benchmark: harvest tracker cost as the number of plantings grows.
+
+Times building the tracker's cards (harvest windows, status, countdown and
+HTML) for --plantings plantings spread over the crop catalog, with several
+succession sowings per crop, two ways:
+
+- per_row:    the previous loop, timedelta math and one HTML string per planting
+- vectorized: bukid.harvest.harvest_windows() plus chart.tracker_cards_html()
+
+and the script run time of drawing them in a Streamlit app (AppTest): the
+previous tracker made one st.markdown element per planting, the vectorized
+one draws every card in a single element.
+
+    python benchmarks/harvest_tracker.py --plantings 10 100 1000 5000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from bukid.crops import days_to_harvest, get_catalog
+from bukid.harvest import harvest_windows, plantings_frame
+import chart
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "harvest_tracker.json"
+
+
+def random_plantings(count: int) -> list[dict]:
+    """count plantings over the catalog's crops, sown within the last 200 days."""
+    rng = random.Random(0)
+    names = [crop.name for crop in get_catalog().crops.values()]
+    today = date.today()
+    return [
+        {"crop": rng.choice(names), "planted": today - timedelta(days=rng.randrange(200)),
+         "bed": f"Bed {rng.randrange(1, 40)}", "quantity": rng.randrange(1, 30)}
+        for _ in range(count)
+    ]
+
+
+def per_row(plantings: list[dict]) -> list[str]:
+    """The tracker as it was: one pass of date math and one HTML string per planting."""
+    today = date.today()
+    cards = []
+    for planting in plantings:
+        planted = planting["planted"]
+        min_days, max_days = days_to_harvest(planting["crop"])
+        harvest_date_early = planted + timedelta(days=min_days)
+        harvest_date_late = planted + timedelta(days=max_days)
+        days_left = (harvest_date_early - today).days
+        if days_left <= 0 and today <= harvest_date_late:
+            countdown_class, countdown_text = "countdown-ready", "🌾 Ready to harvest!"
+        elif today > harvest_date_late:
+            countdown_class, countdown_text = "countdown-ready", "🌾 Past harvest window"
+        elif days_left <= 14:
+            countdown_class, countdown_text = "countdown-soon", f"⏳ {days_left} days to go"
+        else:
+            countdown_class, countdown_text = "countdown-later", f"{days_left} days to go"
+        harvest_range = f"{harvest_date_early.strftime('%b %d')} – {harvest_date_late.strftime('%b %d, %Y')}"
+        cards.append(f"""<div class="tracker-card">
+            <div class="tracker-row">
+                <span class="tracker-veg">🌱 {planting["crop"]}</span>
+                <span class="tracker-countdown {countdown_class}">{countdown_text}</span>
+            </div>
+            <div class="tracker-dates" style="margin-top:8px">
+                <div class="tracker-date-item"><strong>Planted</strong>{planted.strftime("%b %d, %Y")}</div>
+                <div class="tracker-date-item"><strong>Expected Harvest</strong>{harvest_range}</div>
+                <div class="tracker-date-item"><strong>Crop Cycle</strong>{min_days}–{max_days} days from seed</div>
+            </div>
+        </div>""")
+    return cards
+
+
+def vectorized(plantings: list[dict]) -> str:
+    return chart.tracker_cards_html(harvest_windows(plantings_frame(plantings)))
+
+
+def tracker_app(root: str, mode: str, count: int):
+    """AppTest script drawing count plantings' tracker cards, one element each (per_row) or all in one."""
+    import sys
+
+    sys.path[:0] = [root, f"{root}/src", f"{root}/benchmarks"]
+    import streamlit as st
+    import harvest_tracker
+
+    plantings = harvest_tracker.random_plantings(count)
+    if mode == "per_row":
+        for card in harvest_tracker.per_row(plantings):
+            st.markdown(card, unsafe_allow_html=True)
+    else:
+        st.markdown(harvest_tracker.vectorized(plantings), unsafe_allow_html=True)
+
+
+def time_render(mode: str, count: int, repeat: int) -> float:
+    """Median milliseconds per script run of tracker_app."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(tracker_app, args=(str(ROOT), mode, count), default_timeout=300)
+    at.run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def time_build(build, plantings: list[dict], repeat: int) -> float:
+    """Median milliseconds per build over repeat builds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(plantings)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plantings", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--render-repeat", type=int, default=3, help="AppTest script runs per mode")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    rows = {}
+    for count in args.plantings:
+        plantings = random_plantings(count)
+        per_row_ms = time_build(per_row, plantings, args.repeat)
+        vectorized_ms = time_build(vectorized, plantings, args.repeat)
+        per_row_render_ms = time_render("per_row", count, args.render_repeat)
+        vectorized_render_ms = time_render("vectorized", count, args.render_repeat)
+        rows[str(count)] = {
+            "build": {"per_row_ms": per_row_ms, "vectorized_ms": vectorized_ms,
+                      "speedup": round(per_row_ms / vectorized_ms, 2)},
+            "render": {"per_row_ms": per_row_render_ms, "vectorized_ms": vectorized_render_ms,
+                       "speedup": round(per_row_render_ms / vectorized_render_ms, 2)},
+        }
+
+    report = {"benchmark": "harvest_tracker", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "plantings": rows}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    for stage in ("build", "render"):
+        print(f"{stage:<6} {'plantings':>10} {'per row':>10} {'vectorized':>11} {'speedup':>8}")
+        for count, row in rows.items():
+            times = row[stage]
+            print(f"{'':<6} {count:>10} {times['per_row_ms']:>8.2f}ms {times['vectorized_ms']:>9.2f}ms "
+                  f"{times['speedup']:>7.2f}x")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
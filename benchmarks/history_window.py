@@ -0,0 +1,113 @@
+"""Benchmark: rerun time and page payload as the chat history grows.
+
+main.py draws only the last BUKID_CHAT_HISTORY_WINDOW messages of the chat
+in full and loads older ones on demand. This runs the planning flow on the
+fixture backend (no API key needed), pads its history with open-chat turns
+to each --lengths value and times full reruns with the window off (0) and on,
+recording script time and the serialized size of the messages the run sends
+to the browser.
+
+    python benchmarks/history_window.py --lengths 50 100 200 400
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["BUKID_LLM_BACKEND"] = "fixture"
+
+from e2e_latency import ROOT, SCRIPT_RUNS, FlowRecorder, git_revision, planning_flow
+from fragment_reruns import PADDING_TURN
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "history_window.json"
+
+
+@contextlib.contextmanager
+def payload_meter(sizes: list[int]):
+    """Append the serialized size of each AppTest run's forward messages to sizes."""
+    from streamlit.testing.v1 import local_script_runner
+
+    original = local_script_runner.parse_tree_from_messages
+
+    def parse_tree_from_messages(messages):
+        sizes.append(sum(message.ByteSize() for message in messages))
+        return original(messages)
+
+    local_script_runner.parse_tree_from_messages = parse_tree_from_messages
+    try:
+        yield
+    finally:
+        local_script_runner.parse_tree_from_messages = original
+
+
+def measure(at, reruns: int) -> dict:
+    times, sizes = [], []
+    with payload_meter(sizes):
+        for _ in range(reruns):
+            SCRIPT_RUNS.clear()
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"Rerun raised: {at.exception[0].value}")
+            times.append(sum(SCRIPT_RUNS))
+    return {
+        "median_run_s": round(statistics.median(times), 4),
+        "payload_kb": round(statistics.median(sizes) / 1024, 1),
+        "chat_messages_drawn": len(at.chat_message),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--window", type=int, default=20, help="BUKID_CHAT_HISTORY_WINDOW when on")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per rerun")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    # Mirror `streamlit run main.py`, which puts the script directory on sys.path
+    sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ["BUKID_CACHE_PATH"] = os.path.join(tmpdir.name, "history.sqlite3")
+    recorder = FlowRecorder(timeout=args.timeout, quiet=True, trace_memory=False)
+    planning_flow(recorder)
+    at = recorder.at
+    flow_messages = list(at.session_state["messages"])
+
+    rows = []
+    for length in args.lengths:
+        turns = max(0, length - len(flow_messages)) // 2
+        at.session_state["messages"] = flow_messages + PADDING_TURN * turns
+        row = {"messages": len(at.session_state["messages"])}
+        for mode, window in (("all", 0), ("windowed", args.window)):
+            os.environ["BUKID_CHAT_HISTORY_WINDOW"] = str(window)
+            row[mode] = measure(at, args.reruns)
+        rows.append(row)
+    os.environ.pop("BUKID_CHAT_HISTORY_WINDOW")
+    tmpdir.cleanup()
+
+    report = {
+        "benchmark": "history_window",
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "window": args.window,
+        "per_length": rows,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{'messages':>8} {'all: run':>10} {'payload':>9} {'window: run':>12} {'payload':>9}")
+    for row in rows:
+        print(f"{row['messages']:>8} {row['all']['median_run_s'] * 1000:8.1f}ms {row['all']['payload_kb']:7.1f}KB "
+              f"{row['windowed']['median_run_s'] * 1000:10.1f}ms {row['windowed']['payload_kb']:7.1f}KB")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
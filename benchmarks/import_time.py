@@ -0,0 +1,108 @@
+"""Cold-start benchmark: what main.py imports before the first page renders.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime``.
+Streamlit and AppTest are imported first and excluded, then the scenario runs
+and every module imported during it is attributed to its top-level package:
+
+- first_page: AppTest renders main.py's first page (the location form)
+- crew:       ``import bukid.crew``, paid by the first step that calls a crew
+
+The per-package self time, the module count and the wall time are summarized
+and written to JSON so cold starts can be compared between commits.
+
+    python benchmarks/import_time.py --repeat 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "import_time.json"
+MARKER = "--- bukid-import-time-start ---"
+END_MARKER = "--- bukid-import-time-end ---"
+
+PRELUDE = f"""
+import sys, time
+sys.path.insert(0, {str(ROOT / "src")!r})
+import streamlit
+from streamlit.testing.v1 import AppTest
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+"""
+# Imports after this point (e.g. main.py's background prewarm) aren't counted
+EPILOGUE = f"""
+sys.stderr.write({END_MARKER!r} + "\\n")
+sys.stderr.flush()
+print(time.perf_counter() - start)
+"""
+
+SCENARIOS = {
+    "first_page": PRELUDE + f"""
+at = AppTest.from_file({str(ROOT / "main.py")!r}, default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+""" + EPILOGUE,
+    "crew": PRELUDE + """
+import bukid.crew
+""" + EPILOGUE,
+}
+
+
+def run_scenario(code: str) -> dict:
+    env = {**os.environ, "BUKID_LLM_BACKEND": "fixture", "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, env=env, check=True,
+    )
+    wall_s = float(proc.stdout.strip().splitlines()[-1])
+
+    packages: Counter = Counter()
+    modules = 0
+    log = proc.stderr.partition(MARKER)[2].partition(END_MARKER)[0]
+    for line in log.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        packages[name.split(".")[0]] += int(self_us)
+        modules += 1
+    return {"wall_s": wall_s, "modules": modules, "packages": packages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per scenario")
+    parser.add_argument("--top", type=int, default=15, help="packages listed per scenario")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    report = {"benchmark": "import_time", "python": sys.version.split()[0], "scenarios": {}}
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        packages = runs[-1]["packages"]
+        report["scenarios"][name] = {
+            "wall_s_median": round(statistics.median(r["wall_s"] for r in runs), 3),
+            "modules_imported": runs[-1]["modules"],
+            "import_self_s": round(sum(packages.values()) / 1e6, 3),
+            "top_packages_ms": {pkg: round(us / 1000, 1) for pkg, us in packages.most_common(args.top)},
+        }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    for name, result in report["scenarios"].items():
+        print(f"{name}: {result['wall_s_median']:.3f}s wall, {result['modules_imported']} modules, "
+              f"{result['import_self_s']:.3f}s importing")
+        for pkg, ms in result["top_packages_ms"].items():
+            print(f"  {pkg:<28} {ms:>9.1f} ms")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark: single-call planning bundle vs. the three-step planning path.
+
+Runs research → schedule → preparation as three crews, then the same plan as
+one planning_bundle_crew call, against the fixture LLM backend with the
+response cache disabled. Reports wall time, LLM calls and total tokens
+(prompt tokens are counted from the real rendered prompts).
+
+    python benchmarks/planning_bundle.py --latency 2 --rounds 3
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+CREW_INPUTS = {
+    "location": "Calamba, Laguna",
+    "previous_year": "2025",
+    "language": "English",
+    "planting_medium": "pots",
+}
+
+
+def token_totals() -> dict:
+    from bukid.llm import DEFAULT_MODEL, get_llm
+
+    totals = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "successful_requests": 0}
+    for llm in {id(l): l for l in (get_llm(DEFAULT_MODEL), get_llm())}.values():
+        usage = llm.get_token_usage_summary()
+        for key in totals:
+            totals[key] += getattr(usage, key)
+    return totals
+
+
+def measure(fn) -> dict:
+    before = token_totals()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    wall = time.perf_counter() - start
+    after = token_totals()
+    return {"wall_s": wall, **{key: after[key] - before[key] for key in after}}
+
+
+def three_step():
+    from bukid.crew import run_preparation, run_research, run_schedule
+
+    research = run_research(CREW_INPUTS)
+    vegetables = "\n".join(v.vegetable for v in research.vegetable_recommendations)
+    run_schedule(CREW_INPUTS, vegetables)
+    run_preparation(CREW_INPUTS, vegetables)
+
+
+def bundled():
+    from bukid.crew import run_planning_bundle
+
+    run_planning_bundle(CREW_INPUTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="artificial fixture latency per LLM call, in seconds")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks" / "results" / "planning_bundle.json")
+    args = parser.parse_args()
+
+    os.environ["BUKID_LLM_BACKEND"] = "fixture"
+    os.environ["BUKID_FIXTURE_LATENCY"] = str(args.latency)
+    os.environ["BUKID_CACHE_DISABLED"] = "1"
+
+    from bukid.crew import crew_factory
+    with contextlib.redirect_stdout(io.StringIO()):
+        crew_factory.warm()
+
+    results = {}
+    for name, fn in (("three_step", three_step), ("bundle", bundled)):
+        runs = [measure(fn) for _ in range(args.rounds)]
+        results[name] = {
+            "wall_s_median": round(statistics.median(r["wall_s"] for r in runs), 4),
+            "llm_calls": runs[0]["successful_requests"],
+            "prompt_tokens": runs[0]["prompt_tokens"],
+            "completion_tokens": runs[0]["completion_tokens"],
+            "total_tokens": runs[0]["total_tokens"],
+        }
+
+    report = {"benchmark": "planning_bundle", "fixture_latency_s": args.latency, "rounds": args.rounds, **results}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{'path':<12} {'wall s':>8} {'calls':>6} {'prompt':>8} {'completion':>11} {'total':>8}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['wall_s_median']:>8.3f} {r['llm_calls']:>6} {r['prompt_tokens']:>8} "
+              f"{r['completion_tokens']:>11} {r['total_tokens']:>8}")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark: knowledge retrieval for the QA and replanting prompts.
+
+Measures, against the documents in knowledge/:
+
+- index build time: a cold build into an empty index file, and a warm start
+  that only checks document hashes and loads the stored chunks;
+- query latency over a set of typical chat questions;
+- prompt size: the top-k snippets injected per question versus putting the
+  whole knowledge base in the prompt (tokens estimated at ~4 characters each);
+- off-topic retrieval: bare location names must match no notes at all. Any
+  snippet for one means an unrelated document is in the index, and the run
+  exits with status 1.
+
+    python benchmarks/retrieval.py --top-k 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bukid.knowledge import KNOWLEDGE_DIR, KnowledgeIndex, format_snippets
+from bukid.llm import estimate_tokens
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "retrieval.json"
+
+QUESTIONS = [
+    "How often should I water tomatoes in pots?",
+    "Why are my pechay leaves full of small holes?",
+    "What can I plant after harvesting eggplant?",
+    "Is kangkong okay to plant during the rainy season?",
+    "How do I grow spring onions from scraps?",
+    "What soil mix should I use for containers?",
+    "When is the best time to plant garlic?",
+    "How do I keep fruit flies off my ampalaya?",
+    "My chili plants suddenly wilted after heavy rain, why?",
+    "How long before I can harvest okra?",
+    "Paano magtanim ng luya sa paso?",
+    "What is a natural spray for aphids?",
+]
+
+# Say nothing about growing anything, so no agronomy note should match them
+LOCATION_QUERIES = [
+    "San Pablo, Laguna",
+    "San Jose, Nueva Ecija",
+    "Quezon City",
+    "Davao City",
+    "Baguio, Benguet",
+    "San Francisco, California",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the question set")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "knowledge.sqlite3"
+        start = time.perf_counter()
+        KnowledgeIndex(KNOWLEDGE_DIR, index_path)
+        cold_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = KnowledgeIndex(KNOWLEDGE_DIR, index_path)
+        warm_s = time.perf_counter() - start
+
+        timings = []
+        for _ in range(args.repeat):
+            for question in QUESTIONS:
+                start = time.perf_counter()
+                index.search(question, top_k=args.top_k)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        full_tokens = sum(estimate_tokens(file.read_text(encoding="utf-8"))
+                          for file in sorted(KNOWLEDGE_DIR.rglob("*")) if file.is_file())
+        context_tokens = [estimate_tokens(format_snippets(index.search(q, top_k=args.top_k))) for q in QUESTIONS]
+        matched = sum(bool(index.search(q, top_k=args.top_k)) for q in QUESTIONS)
+        off_topic = {q: [f"{snippet.source}: {snippet.title}" for snippet in index.search(q, top_k=args.top_k)]
+                     for q in LOCATION_QUERIES}
+        off_topic = {q: hits for q, hits in off_topic.items() if hits}
+        stats = index.stats()
+
+    timings.sort()
+    mean_context = statistics.mean(context_tokens)
+    report = {
+        "benchmark": "retrieval",
+        "documents": stats["documents"],
+        "chunks": stats["chunks"],
+        "terms": stats["terms"],
+        "top_k": args.top_k,
+        "build": {"cold_ms": round(cold_s * 1000, 2), "warm_ms": round(warm_s * 1000, 2)},
+        "query_ms": {
+            "p50": round(timings[len(timings) // 2], 4),
+            "p95": round(timings[int(len(timings) * 0.95)], 4),
+            "max": round(timings[-1], 4),
+        },
+        "prompt_tokens": {
+            "whole_knowledge_base": full_tokens,
+            "top_k_mean": round(mean_context, 1),
+            "top_k_max": max(context_tokens),
+            "reduction": round(1 - mean_context / full_tokens, 3),
+        },
+        "questions_with_snippets": f"{matched}/{len(QUESTIONS)}",
+        "location_queries_with_snippets": f"{len(off_topic)}/{len(LOCATION_QUERIES)}",
+        "off_topic_snippets": off_topic,
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    print(f"\nWrote {args.output}")
+    if off_topic:
+        print("Location names retrieved unrelated notes; only curated agronomy notes belong in knowledge/")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
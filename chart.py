@@ -1,6 +1,13 @@
-import plotly.express as px
-import pandas as pd
+import hashlib
+import html
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
 import streamlit as st
+from bukid import metrics
+from bukid.crops import days_to_harvest
 from bukid.models.models import VegetableScheduleOutput, VegetablePreparationOutput, VegetableResearchOutput, ReplantingOutput
 from datetime import date
 
@@ -64,22 +71,78 @@ def month_to_date(month: int, day: int = 1) -> str:
     year = date.today().year
     return f"{year}-{month:02d}-{day:02d}"
 
-def render_schedule_cards(output: VegetableScheduleOutput):
-    st.subheader("🌱 Planting & Harvest Schedule")
-    for v in output.vegetable_schedule:
-        with st.expander(f"🥬 {v.vegetable}", expanded=False):
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("**🌱 Plant**")
-                st.markdown(f"{MONTH_NAMES[v.plant_start_month]} → {MONTH_NAMES[v.plant_end_month]}")
-            with col2:
-                st.markdown("**🌾 Harvest**")
-                st.markdown(f"{MONTH_NAMES[v.harvest_start_month]} → {MONTH_NAMES[v.harvest_end_month]}")
+# ── Memoized builders ─────────────────────────────────────────────
+# Every rerun replays the whole chat history, so each result is rendered again
+# and again. Figures, tables and card payloads are built once per distinct
+# result (by content hash) and shared across reruns and sessions.
+DEFAULT_CHART_CACHE_MAX_ENTRIES = 128
 
-            st.markdown(f"**🌿 Companion Plant:** {v.companion_plant}")
-            #st.markdown(f"**💡 Why it thrives:** {v.reason}")
+_built: OrderedDict = OrderedDict()
+_built_lock = threading.Lock()
+
+
+def _max_entries() -> int:
+    return int(os.environ.get("BUKID_CHART_CACHE_MAX_ENTRIES", DEFAULT_CHART_CACHE_MAX_ENTRIES))
+
+
+def content_hash(output) -> str:
+    """sha256 of a result's JSON, identical for equal results however they were produced."""
+    return hashlib.sha256(output.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def memoized(build):
+    """Cache build(output) on the content hash of output, least recently used evicted first.
+
+    Built objects are shared, so callers must not mutate them. A limit of 0
+    turns the memo off.
+    """
+    kind = build.__name__
+
+    @wraps(build)
+    def wrapper(output):
+        limit = _max_entries()
+        if limit <= 0:
+            return build(output)
+        key = (kind, content_hash(output))
+        with _built_lock:
+            if key in _built:
+                _built.move_to_end(key)
+                metrics.CHART_BUILDS.inc(kind=kind, outcome="hit")
+                return _built[key]
+        value = build(output)
+        metrics.CHART_BUILDS.inc(kind=kind, outcome="built")
+        with _built_lock:
+            _built[key] = value
+            _built.move_to_end(key)
+            while len(_built) > limit:
+                _built.popitem(last=False)
+        return value
+
+    return wrapper
+
+
+def clear_chart_cache() -> None:
+    with _built_lock:
+        _built.clear()
+
+
+@memoized
+def schedule_cards(output: VegetableScheduleOutput) -> list[tuple[str, str, str, str]]:
+    """(vegetable, plant months, harvest months, companion) per scheduled vegetable."""
+    return [(
+        v.vegetable,
+        f"{MONTH_NAMES[v.plant_start_month]} → {MONTH_NAMES[v.plant_end_month]}",
+        f"{MONTH_NAMES[v.harvest_start_month]} → {MONTH_NAMES[v.harvest_end_month]}",
+        v.companion_plant,
+    ) for v in output.vegetable_schedule]
+
+
+@memoized
+def gantt_figure(output: VegetableScheduleOutput):
+    # plotly and pandas load on the first chart rather than with the first page
+    import pandas as pd
+    import plotly.express as px
 
-def render_gantt(output: VegetableScheduleOutput):
     rows = []
     for v in output.vegetable_schedule:
         rows.append({
@@ -132,8 +195,81 @@ def render_gantt(output: VegetableScheduleOutput):
 
     # Make bars thicker for touch
     fig.update_traces(width=0.6)
+    return fig
+
 
-    st.plotly_chart(fig, width='stretch', config={
+@memoized
+def summary_table(output: VegetableScheduleOutput):
+    import pandas as pd
+
+    rows = [{
+        "Vegetable": v.vegetable,
+        "Plant": f"{MONTH_NAMES[v.plant_start_month]} → {MONTH_NAMES[v.plant_end_month]}",
+        "Harvest": f"{MONTH_NAMES[v.harvest_start_month]} → {MONTH_NAMES[v.harvest_end_month]}",
+        #"Price Range": f"{v.vegetable_price_currency} {v.vegetable_price.low} – {v.vegetable_price.high}/kg",
+        "Companion Plant": v.companion_plant,
+        #"Why it thrives": v.reason
+    } for v in output.vegetable_schedule]
+    return pd.DataFrame(rows)
+
+
+@memoized
+def preparation_cards(output: VegetablePreparationOutput) -> list[tuple[str, list[str]]]:
+    """(vegetable, markdown lines) per vegetable in the preparation guide."""
+    cards = []
+    for v in output.vegetable_preparation:
+        # Scraps row
+        if v.can_grow_from_scraps:
+            lines = ["**♻️ Can grow from food scraps?** ✅ Yes", f"**How:** {v.scraps_how}"]
+        else:
+            lines = ["**♻️ Can grow from food scraps?** ❌ No"]
+        # Lead time, special tips
+        lines.append(f"**📅 Start preparation:** {v.prep_lead_time}")
+        lines.append(f"**💡 Special tips:** {v.special_tips}")
+        cards.append((v.vegetable, lines))
+    return cards
+
+
+@memoized
+def research_cards(output: VegetableResearchOutput) -> list[tuple[str, list[str]]]:
+    """(vegetable, markdown lines) per recommended vegetable."""
+    cards = []
+    for v in output.vegetable_recommendations:
+        lines = [f"**💡 Why it suits you:** {v.reason}"]
+        if v.pot_size:
+            lines.append(f"**🪴 Recommended pot size:** {v.pot_size}")
+        cards.append((v.vegetable, lines))
+    return cards
+
+
+@memoized
+def replanting_cards(output: ReplantingOutput) -> list[tuple[str, list[str]]]:
+    """(vegetable, markdown lines) per vegetable recommended after the harvest."""
+    return [(rec.vegetable, [
+        f"**♻️ Why after {output.harvested_vegetable}:** {rec.reason}",
+        f"**📅 When to plant:** {rec.best_time_to_plant}",
+        f"**💡 Tip:** {rec.tip}",
+    ]) for rec in output.recommendations]
+
+
+# ── Rendering ─────────────────────────────────────────────────────
+def render_schedule_cards(output: VegetableScheduleOutput):
+    st.subheader("🌱 Planting & Harvest Schedule")
+    for vegetable, plant, harvest, companion in schedule_cards(output):
+        with st.expander(f"🥬 {vegetable}", expanded=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**🌱 Plant**")
+                st.markdown(plant)
+            with col2:
+                st.markdown("**🌾 Harvest**")
+                st.markdown(harvest)
+
+            st.markdown(f"**🌿 Companion Plant:** {companion}")
+
+
+def render_gantt(output: VegetableScheduleOutput):
+    st.plotly_chart(gantt_figure(output), width='stretch', config={
         "displayModeBar": False,    # 👈 hide the plotly toolbar on mobile
         "scrollZoom": False
     })
@@ -150,16 +286,7 @@ def render_schedule_mobile_friendly(output: VegetableScheduleOutput):
 
 def render_summary_table(output: VegetableScheduleOutput):
     """Show a summary table"""
-    rows = [{
-        "Vegetable": v.vegetable,
-        "Plant": f"{MONTH_NAMES[v.plant_start_month]} → {MONTH_NAMES[v.plant_end_month]}",
-        "Harvest": f"{MONTH_NAMES[v.harvest_start_month]} → {MONTH_NAMES[v.harvest_end_month]}",
-        #"Price Range": f"{v.vegetable_price_currency} {v.vegetable_price.low} – {v.vegetable_price.high}/kg",
-        "Companion Plant": v.companion_plant,
-        #"Why it thrives": v.reason
-    } for v in output.vegetable_schedule]
-
-    st.dataframe(pd.DataFrame(rows), width='stretch', hide_index=True)
+    st.dataframe(summary_table(output), width='stretch', hide_index=True)
 
 
 def render_preparation_cards(output: VegetablePreparationOutput):
@@ -168,20 +295,10 @@ def render_preparation_cards(output: VegetablePreparationOutput):
     if output.notes:
         st.info(output.notes)
 
-    for v in output.vegetable_preparation:
-        with st.expander(f"🥬 {v.vegetable}", expanded=False):
-            # Scraps row
-            if v.can_grow_from_scraps:
-                st.markdown("**♻️ Can grow from food scraps?** ✅ Yes")
-                st.markdown(f"**How:** {v.scraps_how}")
-            else:
-                st.markdown("**♻️ Can grow from food scraps?** ❌ No")
-
-            # Lead time
-            st.markdown(f"**📅 Start preparation:** {v.prep_lead_time}")
-
-            # Special tips
-            st.markdown(f"**💡 Special tips:** {v.special_tips}")
+    for vegetable, lines in preparation_cards(output):
+        with st.expander(f"🥬 {vegetable}", expanded=False):
+            for line in lines:
+                st.markdown(line)
 
 
 def render_research_cards(output: VegetableResearchOutput):
@@ -190,150 +307,96 @@ def render_research_cards(output: VegetableResearchOutput):
     if output.summary:
         st.info(output.summary)
 
-    for v in output.vegetable_recommendations:
-        with st.expander(f"🌱 {v.vegetable}", expanded=False):
-            st.markdown(f"**💡 Why it suits you:** {v.reason}")
-            if v.pot_size:
-                st.markdown(f"**🪴 Recommended pot size:** {v.pot_size}")
-
-
-
-# Days from seed to first harvest (min, max) for common vegetables
-DAYS_TO_HARVEST = {
-    "amaranth":         (50,  75),
-    "ampalaya":         (60,  75),
-    "basil":            (25,  35),
-    "bitter gourd":     (60,  75),
-    "bitter melon":     (60,  75),
-    "bottle gourd":     (55,  65),
-    "broccoli":         (80, 100),
-    "cabbage":          (70,  90),
-    "kangkong":         (21,  30),
-    "water spinach":    (21,  30),
-    "carrot":           (70,  80),
-    "cauliflower":      (80, 100),
-    "celery":           (85, 120),
-    "chili":            (70,  90),
-    "chili pepper":     (70,  90),
-    "chinese cabbage":  (50,  70),
-    "pechay":           (30,  45),
-    "bokchoy":          (30,  45),
-    "bok choy":         (30,  45),
-    "cilantro":         (21,  28),
-    "coriander":        (21,  28),
-    "corn":             (60,  90),
-    "cucumber":         (50,  70),
-    "eggplant":         (70,  85),
-    "talong":           (70,  85),
-    "garlic":           (90, 120),
-    "ginger":           (180, 240),
-    "green bean":       (50,  65),
-    "sitaw":            (50,  65),
-    "string bean":      (50,  65),
-    "lettuce":          (30,  60),
-    "malunggay":        (60,  90),
-    "moringa":          (60,  90),
-    "mongo":            (55,  65),
-    "mung bean":        (55,  65),
-    "mustard":          (30,  40),
-    "mustasa":          (30,  40),
-    "okra":             (55,  65),
-    "onion":            (90, 120),
-    "patola":           (60,  75),
-    "luffa":            (60,  75),
-    "pepper":           (70,  90),
-    "potato":           (70, 120),
-    "pumpkin":          (75, 100),
-    "kalabasa":         (75, 100),
-    "radish":           (25,  35),
-    "labanos":          (25,  35),
-    "saluyot":          (30,  45),
-    "jute":             (30,  45),
-    "spinach":          (37,  45),
-    "squash":           (50,  65),
-    "sweet potato":     (90, 120),
-    "kamote":           (90, 120),
-    "tomato":           (60,  85),
-    "kamatis":          (60,  85),
-    "turnip":           (45,  60),
-    "upo":              (55,  65),
-    "white gourd":      (55,  65),
-    "winged bean":      (60,  75),
-    "sigarilyas":       (60,  75),
-    "zucchini":         (45,  55),
-}
+    for vegetable, lines in research_cards(output):
+        with st.expander(f"🌱 {vegetable}", expanded=False):
+            for line in lines:
+                st.markdown(line)
+
+
 
 def get_days_to_harvest(vegetable_name: str) -> tuple[int, int]:
     """Return (min_days, max_days) for a vegetable, falling back to a sensible default."""
-    key = vegetable_name.strip().lower()
-    if key in DAYS_TO_HARVEST:
-        return DAYS_TO_HARVEST[key]
-    # Try partial match
-    for k, v in DAYS_TO_HARVEST.items():
-        if k in key or key in k:
-            return v
-    return (60, 90)  # generic fallback
+    return days_to_harvest(vegetable_name)
+
+
+COUNTDOWN_CLASSES = {
+    "ready": "countdown-ready",
+    "past": "countdown-ready",
+    "soon": "countdown-soon",
+    "later": "countdown-later",
+}
+
+
+TRACKER_CARD_HTML = (
+    '<div class="tracker-card"><div class="tracker-row">'
+    '<span class="tracker-veg">🌱 {}</span><span class="tracker-countdown {}">{}</span></div>'
+    '<div class="tracker-dates" style="margin-top:8px">'
+    '<div class="tracker-date-item"><strong>Planted</strong>{}</div>'
+    '<div class="tracker-date-item"><strong>Expected Harvest</strong>{}</div>'
+    '<div class="tracker-date-item"><strong>Crop Cycle</strong>{}</div>'
+    '</div></div>'
+)
+
+
+def _format_distinct(values, format_value):
+    """format_value applied once per distinct value, spread back over values as an object array."""
+    import numpy as np
+    import pandas as pd
+
+    codes, distinct = pd.factorize(values)
+    return np.array([format_value(value) for value in distinct.tolist()], dtype=object)[codes]
+
+
+def tracker_cards_html(windows) -> str:
+    """One HTML block with a tracker card per planting, from harvest_windows().
+
+    Plantings share a handful of crops, dates and beds, so each distinct value
+    is formatted once and every card is one fill of TRACKER_CARD_HTML.
+    """
+    import numpy as np
+
+    if windows.empty:
+        return ""
+    status = windows["status"].to_numpy(dtype=object)
+    days_left = _format_distinct(windows["days_left"].to_numpy(), str)
+    countdown_text = np.select(
+        [status == "ready", status == "past", status == "soon"],
+        ["🌾 Ready to harvest!", "🌾 Past harvest window", "⏳ " + days_left + " days to go"],
+        default=days_left + " days to go",
+    )
+    quantity = windows["quantity"].to_numpy()
+    bed = windows["bed"].to_numpy(dtype=object)
+    label = (
+        _format_distinct(windows["crop"].to_numpy(dtype=object), lambda crop: html.escape(str(crop)))
+        + np.where(quantity > 1, _format_distinct(quantity, lambda n: f" × {n}"), "")
+        + np.where(bed != "", _format_distinct(bed, lambda b: f" · {html.escape(b)}"), "")
+    )
+    planted = _format_distinct(windows["planted"].to_numpy(dtype="datetime64[D]"), lambda day: day.strftime("%b %d, %Y"))
+    harvest_range = (
+        _format_distinct(windows["harvest_early"].to_numpy(dtype="datetime64[D]"), lambda day: day.strftime("%b %d"))
+        + " – "
+        + _format_distinct(windows["harvest_late"].to_numpy(dtype="datetime64[D]"), lambda day: day.strftime("%b %d, %Y"))
+    )
+    cycle = windows["min_days"].to_numpy() * 10_000 + windows["max_days"].to_numpy()
+    cycle_note = _format_distinct(cycle, lambda days: f"{days // 10_000}–{days % 10_000} days from seed")
+    countdown_class = _format_distinct(status, COUNTDOWN_CLASSES.get)
+
+    return "\n".join(map(TRACKER_CARD_HTML.format, label, countdown_class, countdown_text, planted, harvest_range, cycle_note))
 
 
 def render_harvest_tracker(schedule_output: VegetableScheduleOutput, planted_dates: dict):
-    from datetime import date, timedelta
+    """Tracker cards for every planting, in one markdown element.
 
-    st.subheader("🌾 Harvest Tracker")
-    st.markdown(HARVEST_TRACKER_CSS, unsafe_allow_html=True)
-
-    today = date.today()
-
-    for v in schedule_output.vegetable_schedule:
-        planted = planted_dates.get(v.vegetable)
-        if not planted:
-            continue
-
-        min_days, max_days = get_days_to_harvest(v.vegetable)
-        harvest_date_early = planted + timedelta(days=min_days)
-        harvest_date_late  = planted + timedelta(days=max_days)
-
-        days_left = (harvest_date_early - today).days
-
-        if days_left <= 0 and today <= harvest_date_late:
-            countdown_class = "countdown-ready"
-            countdown_text  = "🌾 Ready to harvest!"
-        elif today > harvest_date_late:
-            countdown_class = "countdown-ready"
-            countdown_text  = "🌾 Past harvest window"
-        elif days_left <= 14:
-            countdown_class = "countdown-soon"
-            countdown_text  = f"⏳ {days_left} days to go"
-        else:
-            countdown_class = "countdown-later"
-            countdown_text  = f"{days_left} days to go"
+    planted_dates maps each vegetable to its plantings (dicts with planted
+    and optional bed/quantity, as the planting-dates form saves them) or
+    just their dates.
+    """
+    # numpy/pandas load with the first tracker, not with the first page
+    from bukid.harvest import harvest_windows, plantings_from_dates
 
-        harvest_range = (
-            f"{harvest_date_early.strftime('%b %d')} – {harvest_date_late.strftime('%b %d, %Y')}"
-        )
-        cycle_note = f"{min_days}–{max_days} days from seed"
-
-        HARVEST_HTML = f"""<div class="tracker-card">
-            <div class="tracker-row">
-                <span class="tracker-veg">🌱 {v.vegetable}</span>
-                <span class="tracker-countdown {countdown_class}">{countdown_text}</span>
-            </div>
-            <div class="tracker-dates" style="margin-top:8px">
-                <div class="tracker-date-item">
-                    <strong>Planted</strong>
-                    {planted.strftime("%b %d, %Y")}
-                </div>
-                <div class="tracker-date-item">
-                    <strong>Expected Harvest</strong>
-                    {harvest_range}
-                </div>
-                <div class="tracker-date-item">
-                    <strong>Crop Cycle</strong>
-                    {cycle_note}
-                </div>
-            </div>
-        </div>"""
-
-        st.markdown(HARVEST_HTML, unsafe_allow_html=True)
+    st.subheader("🌾 Harvest Tracker")
+    plantings = plantings_from_dates(planted_dates, order=[v.vegetable for v in schedule_output.vegetable_schedule])
+    st.markdown(HARVEST_TRACKER_CSS + tracker_cards_html(harvest_windows(plantings)), unsafe_allow_html=True)
 
 
 def render_replanting_cards(output: ReplantingOutput):
@@ -342,8 +405,7 @@ def render_replanting_cards(output: ReplantingOutput):
     if output.soil_rest_advice:
         st.info(f"🌍 **Soil advice:** {output.soil_rest_advice}")
 
-    for rec in output.recommendations:
-        with st.expander(f"🌱 {rec.vegetable}", expanded=False):
-            st.markdown(f"**♻️ Why after {output.harvested_vegetable}:** {rec.reason}")
-            st.markdown(f"**📅 When to plant:** {rec.best_time_to_plant}")
-            st.markdown(f"**💡 Tip:** {rec.tip}")
\ No newline at end of file
+    for vegetable, lines in replanting_cards(output):
+        with st.expander(f"🌱 {vegetable}", expanded=False):
+            for line in lines:
+                st.markdown(line)
@@ -2,9 +2,12 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
+import importlib
+import logging
+import threading
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime, date
-from bukid.crew import run_research, run_schedule, run_qa, run_preparation, run_replanting
 from chart import (
     render_schedule_mobile_friendly, render_summary_table,
     render_preparation_cards, render_research_cards,
@@ -14,6 +17,35 @@ from chart import (
 from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
 
+from bukid.budgets import BudgetExceeded
+from bukid.metrics import start_metrics_server
+# Prometheus-style /metrics endpoint, only when BUKID_METRICS_PORT is set (started once per process)
+start_metrics_server()
+
+logger = logging.getLogger("bukid.app")
+
+
+def crews():
+    """bukid.crew, imported on first use: crewai and the LLM clients take seconds to
+    load and aren't needed until the first crew runs, so the first page doesn't wait for them."""
+    return importlib.import_module("bukid.crew")
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm_crews() -> threading.Thread:
+    """Import bukid.crew and build the crews in the background, once per process,
+    while the user is still filling in the first form."""
+    def warm():
+        try:
+            crews().crew_factory.warm()
+        except Exception:
+            # The first real crew call imports and builds again and reports the error
+            pass
+
+    thread = threading.Thread(target=warm, name="bukid-prewarm", daemon=True)
+    thread.start()
+    return thread
+
 
 import streamlit.components.v1 as components
 import requests
@@ -67,6 +99,44 @@ def t(english: str, tagalog: str) -> str:
     return english
 
 
+def show_try_again():
+    """Shown when a crew runs past its latency budget (bukid.budgets.BudgetExceeded)."""
+    st.warning(t(
+        "⏳ That took longer than it should. Please try again.",
+        "⏳ Masyadong natagalan iyon. Pakisubukan muli."
+    ))
+
+
+def planning_inputs_key() -> tuple:
+    return (
+        st.session_state.location,
+        st.session_state.language,
+        st.session_state.planting_medium,
+        st.session_state.vegetables,
+    )
+
+
+def start_planning_crews():
+    """Kick off schedule + preparation in the background as soon as the vegetable list is final."""
+    st.session_state.planning_futures = {
+        "key": planning_inputs_key(),
+        **crews().start_planning(crew_inputs, st.session_state.vegetables, st.session_state.get("planning_bundle")),
+    }
+
+
+def planning_result(name: str, fallback):
+    """Wait for a crew started by start_planning_crews, or run it now if inputs changed since."""
+    futures = st.session_state.get("planning_futures")
+    if futures and futures["key"] == planning_inputs_key() and name in futures:
+        try:
+            return futures[name].result()
+        except Exception:
+            # Don't keep re-raising the same failure on every rerun: drop it and try once more here
+            futures.pop(name)
+            logger.warning("Background %s crew failed, running it again in the foreground", name, exc_info=True)
+    return fallback(crew_inputs, st.session_state.vegetables)
+
+
 # ── Page config ───────────────────────────────────────────────────
 #st.markdown("""
 #    <style>
@@ -97,6 +167,8 @@ if not st.session_state.location:
                 st.rerun()
             else:
                 st.warning("Please enter your location to continue.")
+    # The form is already on screen; load the crews while the user types
+    prewarm_crews()
     st.stop()
 
 st.success(f"📍 Garden location: {st.session_state.location}")
@@ -157,6 +229,7 @@ if not st.session_state.user_mode:
 
 # ── crew_inputs (available after location + language confirmed) ───
 crew_inputs = {
+    # As typed: cache keys use the canonical location ID, the crews see what the user wrote
     "location": st.session_state.location,
     "previous_year": str(datetime.now().year - 1),
     "language": st.session_state.language,
@@ -183,6 +256,7 @@ defaults = {
     "preparation_output": None,
     "tracker_shown": False,
     "planted_dates": {},
+    "planting_rows": {},
     "awaiting_tracker": False,
     "harvested_vegetable": None,
     "replanting_output": None,
@@ -200,7 +274,7 @@ for key, val in defaults.items():
 
 
 # ── Chat history replay ───────────────────────────────────────────
-for message in st.session_state.messages:
+def render_message(message: dict):
     with st.chat_message(message["role"]):
         if message["content"] == "__SCHEDULE_CHART__":
             render_schedule_mobile_friendly(st.session_state.schedule_output)
@@ -220,17 +294,86 @@ for message in st.session_state.messages:
             st.markdown(message["content"])
 
 
+# Messages fully drawn on each full run; older ones load a page at a time on demand
+HISTORY_WINDOW = int(os.environ.get("BUKID_CHAT_HISTORY_WINDOW", 20))
+
+
+def show_earlier_messages():
+    st.session_state.earlier_shown = st.session_state.get("earlier_shown", 0) + HISTORY_WINDOW
+
+
+@st.fragment(key="earlier_messages")
+def render_earlier_messages(end: int):
+    """Messages before the recent window, behind a button that loads HISTORY_WINDOW more per click."""
+    start = max(0, end - st.session_state.get("earlier_shown", 0))
+    if start > 0:
+        st.button(
+            t(f"⬆️ Show earlier messages ({start})", f"⬆️ Ipakita ang mga naunang mensahe ({start})"),
+            use_container_width=True, key="show_earlier", on_click=show_earlier_messages,
+        )
+    for message in st.session_state.messages[start:end]:
+        render_message(message)
+
+
+def render_history():
+    """Replay the chat: the last HISTORY_WINDOW messages in full, older ones on demand
+    (all of them when it is 0). Only full runs get here; fragment reruns keep what it drew."""
+    messages = st.session_state.messages
+    recent = max(0, len(messages) - HISTORY_WINDOW) if HISTORY_WINDOW > 0 else 0
+    if recent:
+        render_earlier_messages(recent)
+    for message in messages[recent:]:
+        render_message(message)
+    st.session_state.replayed = len(messages)
+
+
+def render_new_messages():
+    """Messages added by fragment reruns since the last full run, which render_history hasn't drawn."""
+    for message in st.session_state.messages[st.session_state.replayed:]:
+        render_message(message)
+
+
+def in_fragment_rerun() -> bool:
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def flow_done() -> bool:
+    """Whether the current branch is finished and the open chat is available."""
+    planning_done = (
+        st.session_state.user_mode == "planning"
+        and st.session_state.preparation_done
+        and not st.session_state.awaiting_confirmation
+    )
+    planted_done = (
+        st.session_state.user_mode == "planted"
+        and st.session_state.already_planted_flow_done
+    )
+    return planning_done or planted_done
+
+
+def next_step():
+    """Rerun for the next step. Within the flow only the active step fragment reruns;
+    a full run, or the end of the flow (which brings up the open chat), reruns the app."""
+    if in_fragment_rerun() and not flow_done():
+        st.rerun(scope="fragment")
+    else:
+        st.rerun()
+
+
 # ── Feedback link ─────────────────────────────────────────────────
-st.divider()
-st.caption(t(
-    "🌱 Taniman is free and still growing. [Share your feedback →](./feedback)",
-    "🌱 Ang Taniman ay libre at patuloy umuunlad. [Ibahagi ang inyong puna →](./feedback)"
-))
+def render_feedback_link():
+    st.divider()
+    st.caption(t(
+        "🌱 Taniman is free and still growing. [Share your feedback →](./feedback)",
+        "🌱 Ang Taniman ay libre at patuloy umuunlad. [Ibahagi ang inyong puna →](./feedback)"
+    ))
+
 
 # ══════════════════════════════════════════════════════════════════
 # BRANCH A: PLANNING MODE
 # ══════════════════════════════════════════════════════════════════
-if st.session_state.user_mode == "planning":
+def planning_step():
 
     # ── A1: Planting medium ───────────────────────────────────────
     if not st.session_state.planting_medium:
@@ -243,13 +386,13 @@ if st.session_state.user_mode == "planning":
             if st.button("🌍 Ground / Diretso sa lupa", use_container_width=True, key="med_ground"):
                 st.session_state.planting_medium = "in-ground"
                 crew_inputs["planting_medium"] = "in-ground"
-                st.rerun()
+                next_step()
         with col2:
             if st.button("🪴 Pots / Paso", use_container_width=True, key="med_pots"):
                 st.session_state.planting_medium = "pots"
                 crew_inputs["planting_medium"] = "pots"
-                st.rerun()
-        st.stop()
+                next_step()
+        return
 
     # Keep crew_inputs in sync
     crew_inputs["planting_medium"] = st.session_state.planting_medium
@@ -261,7 +404,14 @@ if st.session_state.user_mode == "planning":
                 "Finding the best vegetables for your area...",
                 "Hinahanap ang pinakamainam na mga gulay para sa inyong lugar..."
             )):
-                result = run_research(crew_inputs)
+                if crews().planning_bundle_enabled():
+                    # One call for research, schedule and preparation; the later
+                    # steps just reveal the pieces already in the bundle
+                    bundle = crews().run_planning_bundle(crew_inputs)
+                    st.session_state.planning_bundle = bundle
+                    result = bundle.research
+                else:
+                    result = crews().run_research(crew_inputs)
             st.session_state.research_output = result
             st.session_state.vegetables = "\n".join(
                 [v.vegetable for v in result.vegetable_recommendations]
@@ -275,7 +425,7 @@ if st.session_state.user_mode == "planning":
         )
         st.session_state.messages.append({"role": "assistant", "content": "__RESEARCH_CARDS__"})
         st.session_state.messages.append({"role": "assistant", "content": follow_up})
-        st.rerun()
+        next_step()
 
     # ── A3: Vegetable feedback ────────────────────────────────────
     if st.session_state.awaiting_feedback:
@@ -305,12 +455,13 @@ if st.session_state.user_mode == "planning":
             with st.chat_message("assistant"):
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
-            st.rerun()
+            next_step()
         elif add_clicked:
             st.warning(t("Please type a vegetable name first.", "Mangyaring mag-type muna ng pangalan ng gulay."))
 
         if done_clicked:
             st.session_state.awaiting_feedback = False
+            start_planning_crews()
             msg = t(
                 "Great! 🌿 **Would you like to design your garden layout first?**",
                 "Magaling! 🌿 **Gusto ba ninyong mag-disenyo ng inyong hardin bago gumawa ng iskedyul?**"
@@ -319,8 +470,8 @@ if st.session_state.user_mode == "planning":
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
             st.session_state.awaiting_garden_design = True
-            st.rerun()
-        st.stop()
+            next_step()
+        return
 
     # ── A4: Garden designer ───────────────────────────────────────
     if st.session_state.awaiting_garden_design and not st.session_state.garden_design_done:
@@ -341,8 +492,8 @@ if st.session_state.user_mode == "planning":
                     st.markdown(msg)
                 st.session_state.messages.append({"role": "assistant", "content": msg})
                 st.session_state.awaiting_confirmation = True
-                st.rerun()
-        st.stop()
+                next_step()
+        return
 
     # ── A5: Schedule confirmation ─────────────────────────────────
     if st.session_state.awaiting_confirmation and st.session_state.garden_design_done:
@@ -357,17 +508,20 @@ if st.session_state.user_mode == "planning":
             no_clicked = st.button(t("❌ No, thanks", "❌ Hindi, salamat"), use_container_width=True, key="schedule_no")
 
         if yes_clicked:
-            st.session_state.awaiting_confirmation = False
             with st.chat_message("assistant"):
                 with st.spinner(t("Creating your planting schedule...", "Ginagawa ang inyong iskedyul ng pagtatanim...")):
-                    schedule = run_schedule(crew_inputs, st.session_state.vegetables)
+                    schedule = planning_result("schedule", crews().run_schedule)
+                # Only once there is a schedule: if the crew failed, the question stays up to try again
+                st.session_state.awaiting_confirmation = False
                 st.session_state.schedule_output = schedule
+                # Set here too: the chart may be outside the history window by the time A6 checks
+                st.session_state.schedule_shown = True
             st.session_state.messages.append({"role": "assistant", "content": "__SCHEDULE_CHART__"})
             st.session_state.messages.append({"role": "assistant", "content": t(
                 "📊 Here's your planting schedule!",
                 "📊 Narito ang inyong iskedyul ng pagtatanim!"
             )})
-            st.rerun()
+            next_step()
 
         if no_clicked:
             st.session_state.awaiting_confirmation = False
@@ -379,8 +533,8 @@ if st.session_state.user_mode == "planning":
             with st.chat_message("assistant"):
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
-            st.rerun()
-        st.stop()
+            next_step()
+        return
 
     # ── A6: Preparation advice ────────────────────────────────────
     if st.session_state.schedule_shown and not st.session_state.preparation_done and not st.session_state.awaiting_preparation:
@@ -401,14 +555,14 @@ if st.session_state.user_mode == "planning":
             no_prep = st.button(t("❌ No, thanks", "❌ Hindi, salamat"), use_container_width=True, key="prep_no")
 
         if yes_prep:
-            st.session_state.awaiting_preparation = False
             with st.chat_message("assistant"):
                 with st.spinner(t("Getting preparation advice...", "Hinahanap ang mga payo sa paghahanda...")):
-                    preparation = run_preparation(crew_inputs, st.session_state.vegetables)
+                    preparation = planning_result("preparation", crews().run_preparation)
+            st.session_state.awaiting_preparation = False
             st.session_state.preparation_output = preparation
             st.session_state.preparation_done = True
             st.session_state.messages.append({"role": "assistant", "content": "__PREPARATION_CARDS__"})
-            st.rerun()
+            next_step()
 
         if no_prep:
             st.session_state.awaiting_preparation = False
@@ -420,14 +574,14 @@ if st.session_state.user_mode == "planning":
             with st.chat_message("assistant"):
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
-            st.rerun()
-        st.stop()
+            next_step()
+        return
 
 
 # ══════════════════════════════════════════════════════════════════
 # BRANCH B: ALREADY PLANTED MODE
 # ══════════════════════════════════════════════════════════════════
-elif st.session_state.user_mode == "planted":
+def planted_step():
 
     # ── B1: Ask what they need ────────────────────────────────────
     if not st.session_state.planted_greeted and not st.session_state.get("awaiting_replanting_direct"):
@@ -440,7 +594,7 @@ elif st.session_state.user_mode == "planted":
         st.session_state.messages.append({"role": "assistant", "content": msg})
         st.session_state.planted_greeted = True
         st.session_state.awaiting_already_planted_choice = True
-        st.rerun()
+        next_step()
 
     if st.session_state.awaiting_already_planted_choice and not st.session_state.already_planted_flow_done:
         col1, col2, col3 = st.columns(3)
@@ -474,7 +628,7 @@ elif st.session_state.user_mode == "planted":
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
             st.session_state.awaiting_planted_vegetables = True
-            st.rerun()
+            next_step()
 
         # ── B2b: Replanting advice ────────────────────────────────
         if replant_clicked:
@@ -491,7 +645,7 @@ elif st.session_state.user_mode == "planted":
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
             st.session_state.awaiting_replanting_direct = True
-            st.rerun()
+            next_step()
 
         # ── B2c: Ask a question ───────────────────────────────────
         if qa_clicked:
@@ -507,9 +661,9 @@ elif st.session_state.user_mode == "planted":
             with st.chat_message("assistant"):
                 st.markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
-            st.rerun()
+            next_step()
 
-        st.stop()
+        return
 
     # ── B2b form: collect harvested vegetable (outside choice block) ──
     if st.session_state.get("awaiting_replanting_direct"):
@@ -520,18 +674,18 @@ elif st.session_state.user_mode == "planted":
             ))
             if st.form_submit_button(t("🌱 Get suggestions", "🌱 Kumuha ng mungkahi")):
                 if harvested.strip():
-                    st.session_state.awaiting_replanting_direct = False
                     st.session_state.harvested_vegetable = harvested.strip()
                     with st.chat_message("assistant"):
                         with st.spinner(t("Finding the best crops to plant next...", "Hinahanap ang pinakamainam na susunod na itatanim...")):
-                            replanting = run_replanting(crew_inputs, harvested.strip())
+                            replanting = crews().run_replanting(crew_inputs, harvested.strip())
+                        st.session_state.awaiting_replanting_direct = False
                         st.session_state.replanting_output = replanting
                     st.session_state.messages.append({"role": "assistant", "content": "__REPLANTING_CARDS__"})
                     st.session_state.already_planted_flow_done = True
-                    st.rerun()
+                    next_step()
                 else:
                     st.warning(t("Please enter a vegetable.", "Mangyaring maglagay ng gulay."))
-        st.stop()
+        return
 
     # ── B2a form: collect vegetable list (outside choice block) ──
     if st.session_state.get("awaiting_planted_vegetables"):
@@ -549,10 +703,10 @@ elif st.session_state.user_mode == "planted":
                     st.session_state.awaiting_confirmation = True
                     user_msg = veg_input.strip()
                     st.session_state.messages.append({"role": "user", "content": user_msg})
-                    st.rerun()
+                    next_step()
                 else:
                     st.warning(t("Please enter at least one vegetable.", "Mangyaring maglagay ng kahit isang gulay."))
-        st.stop()
+        return
 
     # ── B3: Harvest schedule flow (reuses planning schedule step) ─
     if st.session_state.awaiting_confirmation and st.session_state.garden_design_done and not st.session_state.schedule_output:
@@ -567,11 +721,11 @@ elif st.session_state.user_mode == "planted":
             no_sched = st.button(t("❌ Skip", "❌ Laktawan"), use_container_width=True, key="ap_sched_no")
 
         if yes_sched:
-            st.session_state.awaiting_confirmation = False
             track_event("schedule_generated", {"location": st.session_state.location, "make_schedule": True})
             with st.chat_message("assistant"):
                 with st.spinner(t("Creating your harvest schedule...", "Ginagawa ang inyong iskedyul ng ani...")):
-                    schedule = run_schedule(crew_inputs, st.session_state.vegetables)
+                    schedule = crews().run_schedule(crew_inputs, st.session_state.vegetables)
+                st.session_state.awaiting_confirmation = False
                 st.session_state.schedule_output = schedule
                 st.session_state.schedule_shown = True
             st.session_state.messages.append({"role": "assistant", "content": "__SCHEDULE_CHART__"})
@@ -579,14 +733,14 @@ elif st.session_state.user_mode == "planted":
                 "📊 Here's your harvest schedule! Now let's log when you planted each vegetable.",
                 "📊 Narito ang inyong iskedyul ng ani! Itala natin kung kailan ninyo naitanim ang bawat gulay."
             )})
-            st.rerun()
+            next_step()
 
         if no_sched:
             track_event("schedule_generated", {"location": st.session_state.location, "make_schedule": False})
             st.session_state.awaiting_confirmation = False
             st.session_state.already_planted_flow_done = True
-            st.rerun()
-        st.stop()
+            next_step()
+        return
 
     # ── B4: Log planting dates → tracker ─────────────────────────
     if st.session_state.schedule_output and not st.session_state.tracker_shown and not st.session_state.awaiting_tracker:
@@ -598,22 +752,39 @@ elif st.session_state.user_mode == "planted":
         with st.chat_message("assistant"):
             st.markdown(msg)
             with st.form("planting_dates_form"):
-                dates = {}
+                # One row per planting: the same vegetable can be in several beds or sown in succession
+                dates, add_row = {}, None
                 for v in schedule.vegetable_schedule:
-                    dates[v.vegetable] = st.date_input(
-                        f"📅 {v.vegetable}",
-                        value=date.today(),
-                        key=f"date_{v.vegetable}"
-                    )
-                if st.form_submit_button(t("💾 Save planting dates", "💾 I-save ang mga petsa")):
-                    st.session_state.planted_dates = dates
-                    st.session_state.tracker_shown = True
-                    st.session_state.awaiting_tracker = False
-                    track_event("harvest_tracker", {"vegetable": st.session_state.vegetables, "location": st.session_state.location})
-                    st.session_state.messages.append({"role": "assistant", "content": msg})
-                    st.session_state.messages.append({"role": "assistant", "content": "__HARVEST_TRACKER__"})
-                    st.rerun()
-        st.stop()
+                    st.markdown(f"**📅 {v.vegetable}**")
+                    dates[v.vegetable] = []
+                    for row in range(st.session_state.planting_rows.get(v.vegetable, 1)):
+                        col1, col2, col3 = st.columns([2, 2, 1])
+                        with col1:
+                            planted = st.date_input(t("Planted on", "Itinanim noong"), value=date.today(),
+                                                    key=f"date_{v.vegetable}_{row}")
+                        with col2:
+                            bed = st.text_input(t("Bed (optional)", "Kama (opsyonal)"), key=f"bed_{v.vegetable}_{row}")
+                        with col3:
+                            quantity = st.number_input(t("Plants", "Tanim"), min_value=1, value=1, step=1,
+                                                       key=f"qty_{v.vegetable}_{row}")
+                        dates[v.vegetable].append({"planted": planted, "bed": bed.strip(), "quantity": int(quantity)})
+                    if st.form_submit_button(t(f"➕ Add another {v.vegetable} planting", f"➕ Magdagdag ng tanim na {v.vegetable}"),
+                                             key=f"add_planting_{v.vegetable}"):
+                        add_row = v.vegetable
+                saved = st.form_submit_button(t("💾 Save planting dates", "💾 I-save ang mga petsa"))
+            if add_row:
+                # Rows already filled in keep their values: they are keyed by vegetable and row
+                st.session_state.planting_rows[add_row] = len(dates[add_row]) + 1
+                next_step()
+            if saved:
+                st.session_state.planted_dates = dates
+                st.session_state.tracker_shown = True
+                st.session_state.awaiting_tracker = False
+                track_event("harvest_tracker", {"vegetable": st.session_state.vegetables, "location": st.session_state.location})
+                st.session_state.messages.append({"role": "assistant", "content": msg})
+                st.session_state.messages.append({"role": "assistant", "content": "__HARVEST_TRACKER__"})
+                next_step()
+        return
 
     # ── B5: Replanting prompt after tracker ───────────────────────
     if st.session_state.tracker_shown and not st.session_state.awaiting_replanting and not st.session_state.replanting_output and not st.session_state.already_planted_flow_done:
@@ -635,40 +806,32 @@ elif st.session_state.user_mode == "planted":
                 options=veg_names
             )
             if st.form_submit_button(t("🌱 Get replanting suggestions", "🌱 Kumuha ng mungkahi")):
-                st.session_state.awaiting_replanting = False
                 st.session_state.harvested_vegetable = harvested
-                st.session_state.already_planted_flow_done = True
                 with st.chat_message("assistant"):
                     with st.spinner(t("Finding the best crops to plant next...", "Hinahanap ang pinakamainam na susunod na itatanim...")):
-                        replanting = run_replanting(crew_inputs, harvested)
+                        replanting = crews().run_replanting(crew_inputs, harvested)
+                    st.session_state.awaiting_replanting = False
+                    st.session_state.already_planted_flow_done = True
                     st.session_state.replanting_output = replanting
                 st.session_state.messages.append({"role": "assistant", "content": "__REPLANTING_CARDS__"})
                 track_event("replanting", {"vegetable": harvested, "location": st.session_state.location})
-                st.rerun()
+                next_step()
 
         col1, col2 = st.columns(2)
         with col2:
             if st.button(t("⏭ Skip", "⏭ Laktawan"), use_container_width=True, key="skip_replant"):
                 st.session_state.awaiting_replanting = False
                 st.session_state.already_planted_flow_done = True
-                st.rerun()
-        st.stop()
+                next_step()
+        return
 
 
 # ══════════════════════════════════════════════════════════════════
 # STEP 6: Open chat — available at end of both branches
 # ══════════════════════════════════════════════════════════════════
-planning_done = (
-    st.session_state.user_mode == "planning"
-    and st.session_state.preparation_done
-    and not st.session_state.awaiting_confirmation
-)
-planted_done = (
-    st.session_state.user_mode == "planted"
-    and st.session_state.already_planted_flow_done
-)
-
-if planning_done or planted_done:
+@st.fragment(key="open_chat")
+def open_chat():
+    render_new_messages()
     if prompt := st.chat_input(t(
         "Ask me anything about your garden...",
         "Magtanong tungkol sa inyong hardin..."
@@ -678,8 +841,42 @@ if planning_done or planted_done:
             st.markdown(prompt)
         with st.chat_message("assistant"):
             track_event("chat_qa", {"location": st.session_state.location})
-            with st.spinner(t("Thinking...", "Nag-iisip...")):
-                result = run_qa(crew_inputs, prompt)
-            st.markdown(result)
+            if "chat_memory" not in st.session_state:
+                from bukid.conversation import chat_memory
+                # Last few turns verbatim plus a running summary, within a fixed token budget
+                st.session_state.chat_memory = chat_memory()
+            try:
+                # Tokens go straight to the page; write_stream returns the full text
+                result = st.write_stream(crews().stream_qa(crew_inputs, prompt, memory=st.session_state.chat_memory))
+            except BudgetExceeded:
+                show_try_again()
+                return
+        # Already on the page; the next question's rerun draws it with render_new_messages
         st.session_state.messages.append({"role": "assistant", "content": result})
-        st.rerun()
\ No newline at end of file
+
+
+# ══════════════════════════════════════════════════════════════════
+# Page layout
+# ══════════════════════════════════════════════════════════════════
+# A full run draws everything. Interacting with the active step or the open
+# chat reruns only that fragment, not the gating, history replay and branch
+# checks above it; the messages a fragment adds are drawn by the fragment
+# itself until the next full run.
+@st.fragment(key="active_step")
+def active_step():
+    render_new_messages()
+    try:
+        if st.session_state.user_mode == "planning":
+            planning_step()
+        elif st.session_state.user_mode == "planted":
+            planted_step()
+    except BudgetExceeded:
+        # Steps only move on once their crew has answered, so the same button or form retries it
+        show_try_again()
+
+
+render_history()
+render_feedback_link()
+active_step()
+if flow_done():
+    open_chat()
@@ -1,20 +1,11 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
 import streamlit as st
 import io
 from PIL import Image, ImageDraw, ImageFont
-
-# ── Emoji map ─────────────────────────────────────────────────────
-VEGETABLE_EMOJI = {
-    "tomato": "🍅", "carrot": "🥕", "spinach": "🥬", "eggplant": "🍆",
-    "pepper": "🫑", "lettuce": "🥗", "cucumber": "🥒", "potato": "🥔",
-    "onion": "🧅", "garlic": "🧄", "corn": "🌽", "broccoli": "🥦",
-    "cabbage": "🥬", "pumpkin": "🎃", "radish": "🌱", "beans": "🫘",
-    "peas": "🌿", "chili": "🌶️", "ginger": "🫚", "sweet potato": "🍠",
-    "kangkong": "🥬", "ampalaya": "🌿", "okra": "🌿", "sitaw": "🫘",
-    "pechay": "🥬", "kamote": "🍠", "malunggay": "🌿", "talong": "🍆",
-    "sibuyas": "🧅", "bawang": "🧄", "luya": "🫚", "sili": "🌶️",
-    "patola": "🌿", "upo": "🌿", "kalabasa": "🎃", "sayote": "🌿",
-    "bataw": "🫘", "mungo": "🫘", "mais": "🌽", "kamatis": "🍅",
-}
+from bukid.crops import crop_emoji, find_crop
 
 TILE_COLORS = [
     "#4a7c59", "#c0392b", "#e67e22", "#8e44ad",
@@ -22,19 +13,17 @@ TILE_COLORS = [
 ]
 
 def veg_emoji(name: str) -> str:
-    name_lower = name.lower().strip()
-    # Try exact match first
-    if name_lower in VEGETABLE_EMOJI:
-        return VEGETABLE_EMOJI[name_lower]
-    # Fall back to partial match
-    for key, emoji in VEGETABLE_EMOJI.items():
-        if key in name_lower:
-            return emoji
-    return "🌱"
+    return crop_emoji(name)
 
 def veg_color(index: int) -> str:
+    # By position in the garden, so every vegetable on the grid gets its own color
     return TILE_COLORS[index % len(TILE_COLORS)]
 
+def veg_spacing(name: str) -> int | None:
+    """Usual distance between plants in cm, when the catalog knows the crop."""
+    crop = find_crop(name)
+    return crop.spacing_cm if crop else None
+
 
 # ── Build vegetable list from session state ───────────────────────
 def get_vegetables() -> list[dict]:
@@ -334,7 +323,9 @@ def garden_designer_page():
     else:
         sel = next((v for v in vegetables if v["name"] == st.session_state.selected_veg), None)
         if sel:
-            st.caption(f"Selected: **{sel['emoji']} {sel['name']}**")
+            spacing = veg_spacing(sel["name"])
+            st.caption(f"Selected: **{sel['emoji']} {sel['name']}**"
+                       + (f" · plant about {spacing} cm apart" if spacing else ""))
 
     st.divider()
 
@@ -0,0 +1,142 @@
+"""Shared admission control for LLM-backed crew kickoffs.
+
+Every Streamlit session in the process funnels its kickoffs through one
+AdmissionController, which bounds how many run at once and how fast new ones
+start (a token bucket sized to the provider's rate limit). Waiting callers are
+admitted by priority class, so an interactive chat answer goes ahead of
+background precompute work.
+
+The priority of the current call comes from a context variable:
+
+    with priority("background"):
+        run_research(crew_inputs)
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from bukid import metrics
+
+
+# Lower value is admitted first
+PRIORITIES = {"interactive": 0, "default": 1, "background": 2}
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_RATE_PER_MINUTE = 50
+DEFAULT_BURST = 10
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("bukid_priority", default="default")
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Run the enclosed crew calls with the given priority class."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority '{name}', expected one of {tuple(PRIORITIES)}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class AdmissionController:
+    """Concurrency limit plus token-bucket rate limit with priority-ordered admission."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+        burst: int = DEFAULT_BURST,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.active = 0
+
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _token_wait(self) -> float:
+        """Seconds until a token is available (0 if one is, or rate limiting is off)."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    @contextmanager
+    def admit(self, priority_name: Optional[str] = None, crew: str = "") -> Iterator[None]:
+        """Hold one slot for the enclosed kickoff, waiting for it in priority order."""
+        priority_name = priority_name or current_priority()
+        ticket = (PRIORITIES[priority_name], next(self._seq))
+        start = time.perf_counter()
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            metrics.ADMISSION_QUEUE.inc(priority=priority_name)
+            try:
+                while True:
+                    if self._waiters[0] == ticket and self.active < self.max_concurrency:
+                        wait = self._token_wait()
+                        if wait == 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                heapq.heappop(self._waiters)
+                if self.rate:
+                    self._tokens -= 1
+                self.active += 1
+            except BaseException:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                raise
+            finally:
+                metrics.ADMISSION_QUEUE.dec(priority=priority_name)
+                # Let the next waiter re-check whether it is now at the head
+                self._cond.notify_all()
+
+        metrics.ADMISSION_WAIT.observe(time.perf_counter() - start, priority=priority_name, crew=crew)
+        metrics.ADMISSION_ACTIVE.inc()
+        try:
+            yield
+        finally:
+            metrics.ADMISSION_ACTIVE.dec()
+            with self._cond:
+                self.active -= 1
+                self._cond.notify_all()
+
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_controller() -> AdmissionController:
+    """Process-wide controller, configured from BUKID_MAX_CONCURRENT_CALLS / BUKID_RATE_LIMIT_* variables."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(
+                max_concurrency=int(os.environ.get("BUKID_MAX_CONCURRENT_CALLS", DEFAULT_MAX_CONCURRENCY)),
+                rate_per_minute=float(os.environ.get("BUKID_RATE_LIMIT_RPM", DEFAULT_RATE_PER_MINUTE)),
+                burst=int(os.environ.get("BUKID_RATE_LIMIT_BURST", DEFAULT_BURST)),
+            )
+        return _controller
@@ -0,0 +1,213 @@
+"""Per-crew latency budgets: hard timeouts, hedged requests and model fallback.
+
+Budgets are read from config/budgets.yaml. run_with_budget() runs a kickoff
+attempt in a worker thread and
+
+- gives up with BudgetExceeded once the crew's timeout has passed, instead of
+  leaving the user's spinner running indefinitely;
+- starts a second, hedged attempt when the first is still running after the
+  crew's observed p95 latency, and returns whichever succeeds first;
+- runs that hedge on the faster fallback model when the primary model's p95
+  no longer fits in what is left of the budget.
+
+stream_with_budget() does the same for streamed answers: the stream must
+produce its first chunk within the crew's first_token_timeout, or it is
+abandoned for a non-streamed call on the fallback model, and it must finish
+within the timeout.
+
+The budget counts from when the first attempt is admitted (bukid.admission),
+not from when it was queued. Abandoned attempts can't be interrupted; they
+finish in the background and their results are dropped.
+"""
+import contextvars
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Generator, Optional, TypeVar
+
+import yaml
+
+from bukid import metrics
+
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "config" / "budgets.yaml"
+# Observed latencies needed before the p95 replaces min_hedge_after
+MIN_P95_SAMPLES = 20
+
+T = TypeVar("T")
+
+
+class BudgetExceeded(TimeoutError):
+    """A crew call ran past its latency budget."""
+
+
+@dataclass(frozen=True)
+class Budget:
+    timeout: float
+    hedge: bool = True
+    min_hedge_after: float = 45.0
+    fallback_model: Optional[str] = None
+    first_token_timeout: Optional[float] = None
+
+
+@lru_cache(maxsize=None)
+def load_budgets(path: Path | str = BUDGETS_PATH) -> dict[str, Budget]:
+    config = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    default = config.pop("default", {})
+    budgets = {name: Budget(**{**default, **(overrides or {})}) for name, overrides in config.items()}
+    budgets["default"] = Budget(**default)
+    return budgets
+
+
+def budget_for(crew_name: str) -> Budget:
+    budgets = load_budgets(os.environ.get("BUKID_BUDGETS_PATH", BUDGETS_PATH))
+    return budgets.get(crew_name, budgets["default"])
+
+
+def budgets_enabled() -> bool:
+    return os.environ.get("BUKID_BUDGETS_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def p95_latency(crew_name: str) -> Optional[float]:
+    """p95 wall time of the crew's real kickoffs, once enough have been observed."""
+    for cache_status in ("miss", "disabled"):
+        if metrics.LATENCY.count(crew=crew_name, cache=cache_status) >= MIN_P95_SAMPLES:
+            return metrics.LATENCY.quantile(0.95, crew=crew_name, cache=cache_status)
+    return None
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("BUKID_BUDGET_WORKERS", 32)),
+    thread_name_prefix="bukid-budget",
+)
+
+
+def _start(attempt: Callable, model: Optional[str], admitted: Callable[[], None]) -> Future:
+    # Keep the caller's context (e.g. its admission priority) in the worker
+    return _executor.submit(contextvars.copy_context().run, attempt, model, admitted)
+
+
+def run_with_budget(crew_name: str, attempt: Callable[[Optional[str], Callable[[], None]], T]) -> tuple[T, Optional[str]]:
+    """Call attempt(model, admitted) within the crew's budget; returns (result, model that produced it).
+
+    model=None means the crew's own model. attempt calls admitted() once it
+    holds its admission slot: the budget's clock starts then, so time queued
+    behind other kickoffs neither counts against the timeout nor starts a hedge.
+    """
+    budget = budget_for(crew_name)
+    admitted: Future = Future()
+
+    def mark_admitted() -> None:
+        if not admitted.done():
+            admitted.set_result(time.monotonic())
+
+    primary = _start(attempt, None, mark_admitted)
+    wait({primary, admitted}, return_when=FIRST_COMPLETED)
+    if not admitted.done():
+        # Failed (or returned) before it was ever admitted
+        return primary.result(), None
+
+    start = admitted.result()
+    deadline = start + budget.timeout
+    p95 = p95_latency(crew_name)
+    hedge_at = start + max(budget.min_hedge_after, p95 or 0) if budget.hedge else None
+
+    models = {primary: None}
+    hedge: Optional[Future] = None
+    pending = {primary}
+    error: Optional[BaseException] = None
+    while True:
+        wake_at = min(deadline, hedge_at) if hedge_at is not None else deadline
+        done, pending = wait(pending, timeout=max(0.0, wake_at - time.monotonic()), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    metrics.BUDGET_EVENTS.inc(crew=crew_name, event="hedge_won")
+                return future.result(), models[future]
+            error = future.exception()
+        if not pending:
+            raise error
+
+        now = time.monotonic()
+        if now >= deadline:
+            metrics.BUDGET_EVENTS.inc(crew=crew_name, event="timeout")
+            raise BudgetExceeded(f"{crew_name} took longer than its {budget.timeout:g}s budget")
+        if hedge_at is not None and now >= hedge_at:
+            hedge_at = None
+            # Another try on the primary model is expected to take about p95
+            model = None
+            if budget.fallback_model and (p95 or budget.min_hedge_after) > deadline - now:
+                model = budget.fallback_model
+                metrics.BUDGET_EVENTS.inc(crew=crew_name, event="fallback")
+            metrics.BUDGET_EVENTS.inc(crew=crew_name, event="hedge")
+            hedge = _start(attempt, model, lambda: None)
+            models[hedge] = model
+            pending = pending | {hedge}
+
+
+def stream_with_budget(
+    crew_name: str,
+    stream: Callable[[Callable[[], None]], Generator[str, None, T]],
+    fallback: Callable[[Optional[str], Callable[[], None]], T],
+) -> Generator[str, None, tuple[T, Optional[str]]]:
+    """Yield the chunks of stream(admitted) within the crew's budget; returns (result, model that produced it).
+
+    stream is a generator function that calls admitted() once it holds its
+    admission slot and returns its result when drained. If no chunk has
+    arrived first_token_timeout seconds after admission, the stream is
+    abandoned and fallback(budget.fallback_model, admitted) answers within
+    what is left of the timeout; its result is yielded whole. Past the
+    timeout, BudgetExceeded is raised, even if chunks were already yielded.
+    """
+    budget = budget_for(crew_name)
+    events: queue.Queue = queue.Queue()
+
+    def pump() -> None:
+        chunks = stream(lambda: events.put(("admitted", time.monotonic())))
+        try:
+            while True:
+                events.put(("chunk", next(chunks)))
+        except StopIteration as stop:
+            events.put(("done", stop.value))
+        except BaseException as e:
+            events.put(("error", e))
+
+    _executor.submit(contextvars.copy_context().run, pump)
+    deadline = first_token_at = None
+    started = False
+    while True:
+        wake_at = deadline if started or first_token_at is None else first_token_at
+        try:
+            event, item = events.get(timeout=None if wake_at is None else max(0.0, wake_at - time.monotonic()))
+        except queue.Empty:
+            if started or first_token_at >= deadline:
+                metrics.BUDGET_EVENTS.inc(crew=crew_name, event="timeout")
+                raise BudgetExceeded(f"{crew_name} took longer than its {budget.timeout:g}s budget")
+            break
+        if event == "admitted":
+            deadline = item + budget.timeout
+            first_token_at = min(deadline, item + (budget.first_token_timeout or budget.timeout))
+        elif event == "chunk":
+            started = True
+            yield item
+        elif event == "done":
+            return item, None
+        else:
+            raise item
+
+    # Nothing streamed in time: answer in one piece on the fallback model instead
+    metrics.BUDGET_EVENTS.inc(crew=crew_name, event="first_token_timeout")
+    if budget.fallback_model:
+        metrics.BUDGET_EVENTS.inc(crew=crew_name, event="fallback")
+    answer = _start(fallback, budget.fallback_model, lambda: None)
+    done, _ = wait({answer}, timeout=max(0.0, deadline - time.monotonic()))
+    if not done:
+        metrics.BUDGET_EVENTS.inc(crew=crew_name, event="timeout")
+        raise BudgetExceeded(f"{crew_name} took longer than its {budget.timeout:g}s budget")
+    result = answer.result()
+    yield result
+    return result, budget.fallback_model
@@ -0,0 +1,226 @@
+"""Disk-backed response cache for crew results.
+
+Results are stored in SQLite keyed on a hash of the crew name and the
+normalized crew inputs, so repeated requests (same town, same language,
+same planting medium) are answered without another kickoff.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel
+
+from bukid.locations import location_key
+
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "responses.sqlite3"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+
+# Inputs naming a choice or a crop, where case never changes the request. Free
+# text (questions, texts to translate, history) keeps its case: proper nouns
+# and acronyms matter there.
+CASE_INSENSITIVE_INPUTS = frozenset({"language", "planting_medium", "vegetable", "vegetables", "harvested_vegetable"})
+
+
+def normalize_inputs(inputs: dict) -> dict:
+    """Collapse whitespace in string inputs so equivalent requests share a key.
+
+    Locations are keyed on their canonical ID, so "Sta. Rosa, Laguna" and
+    "Santa Rosa Laguna" share cached results. Only CASE_INSENSITIVE_INPUTS
+    are case-folded.
+    """
+    normalized = {}
+    for key, value in inputs.items():
+        if key == "location" and isinstance(value, str):
+            value = location_key(value)
+        elif isinstance(value, str):
+            value = " ".join(value.split())
+            if key in CASE_INSENSITIVE_INPUTS:
+                value = value.lower()
+        normalized[key] = value
+    return normalized
+
+
+def make_key(namespace: str, inputs: dict) -> str:
+    payload = json.dumps(
+        {"namespace": namespace, "inputs": normalize_inputs(inputs)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite cache with TTL expiry, size-bounded LRU eviction and hit/miss counters."""
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                namespace   TEXT NOT NULL,
+                model       TEXT NOT NULL,
+                payload     TEXT NOT NULL,
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    # ── Lookups ───────────────────────────────────────────────────
+    def get(self, namespace: str, inputs: dict, model: Optional[Type[BaseModel]] = None) -> Any:
+        """Return the cached value, or None on a miss or an expired entry."""
+        key = make_key(namespace, inputs)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT model, payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            model_name, payload, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            try:
+                if model is not None and model_name == model.__name__:
+                    value = model.model_validate_json(payload)
+                elif model is None and model_name == "str":
+                    value = json.loads(payload)
+                else:
+                    # Stored under a different schema (e.g. the model changed) — treat as a miss.
+                    value = None
+            except ValueError:
+                value = None
+
+            if value is None:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, namespace: str, inputs: dict, value: Any) -> None:
+        if isinstance(value, BaseModel):
+            model_name = type(value).__name__
+            payload = value.model_dump_json()
+        elif isinstance(value, str):
+            model_name = "str"
+            payload = json.dumps(value, ensure_ascii=False)
+        else:
+            raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+        key = make_key(namespace, inputs)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, namespace, model, payload, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, model_name, payload, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the least recently used rows above max_entries (caller holds the lock)."""
+        if not self.max_entries:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+
+    # ── Maintenance ───────────────────────────────────────────────
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def cache_path() -> Path:
+    """The cache file: BUKID_CACHE_PATH, or DEFAULT_CACHE_PATH when unset."""
+    return Path(os.environ.get("BUKID_CACHE_PATH") or DEFAULT_CACHE_PATH)
+
+
+def get_cache() -> ResponseCache:
+    """Process-wide cache, configured from BUKID_CACHE_* environment variables."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                path=cache_path(),
+                ttl_seconds=float(os.environ.get("BUKID_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                max_entries=int(os.environ.get("BUKID_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return _cache
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("BUKID_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
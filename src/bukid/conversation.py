@@ -0,0 +1,144 @@
+"""Bounded conversational memory for open chat.
+
+Follow-up questions ("what about in pots?") need the earlier conversation,
+but passing the whole chat history makes every prompt longer than the last.
+ConversationMemory keeps the most recent turns verbatim and folds older ones
+into a running summary, and renders both within a fixed token budget however
+long the chat gets.
+
+The summary itself is written by summary_crew in the background (see
+bukid.crew); this module decides what is kept, what gets folded and what fits.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from bukid import metrics
+from bukid.llm import estimate_tokens
+
+
+DEFAULT_MAX_TURNS = 4
+DEFAULT_TOKEN_BUDGET = 600
+# Share of the budget the summary of older turns may take; the rest is for recent turns
+SUMMARY_BUDGET_SHARE = 0.3
+NO_HISTORY = "(none, this is the first question)"
+
+# Questions leaning on earlier turns: "what about ...", "and ...", pronouns, Tagalog "naman"
+_FOLLOW_UP = re.compile(
+    r"^\s*(what|how)\s+about\b|^\s*(and|also|then|so|but|eh|e)\b"
+    r"|\b(it|its|they|them|those|these|that|this|there|one|ones)\b"
+    r"|\b(naman|iyan|iyon|yan|yun|diyan|doon|nito|niyan|niyon)\b",
+    re.IGNORECASE,
+)
+
+
+def is_follow_up(question: str) -> bool:
+    """Whether the question probably only makes sense together with the earlier turns."""
+    return bool(_FOLLOW_UP.search(question)) or len(question.split()) <= 3
+
+
+def _clip(text: str, tokens: int) -> str:
+    """text cut to about the given number of tokens."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    return text[: max(0, tokens * 4 - 2)].rstrip() + "…"
+
+
+@dataclass(frozen=True)
+class Turn:
+    question: str
+    answer: str
+
+    def render(self) -> str:
+        return f"User: {self.question}\nAssistant: {self.answer}"
+
+
+class ConversationMemory:
+    """The last max_turns turns verbatim plus a running summary of the ones before."""
+
+    def __init__(self, max_turns: int = DEFAULT_MAX_TURNS, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_budget = int(token_budget * SUMMARY_BUDGET_SHARE)
+        self.summary = ""
+        self.turns: list[Turn] = []
+        self.folded = 0
+        # (future, number of turns) while summary_crew folds the oldest turns
+        self.summarizing: Optional[tuple[Any, int]] = None
+        # Tokens of history rendered for each question asked
+        self.context_tokens: list[int] = []
+
+    def add(self, question: str, answer: str) -> None:
+        self.turns.append(Turn(question, answer))
+
+    def __bool__(self) -> bool:
+        return bool(self.turns or self.summary)
+
+    def last_question(self) -> str:
+        return self.turns[-1].question if self.turns else ""
+
+    def to_fold(self) -> list[Turn]:
+        """Oldest turns that no longer fit the verbatim window, by count or by tokens."""
+        kept, used = 0, 0
+        turn_budget = self.token_budget - self.summary_budget
+        for turn in reversed(self.turns):
+            cost = estimate_tokens(turn.render())
+            # The newest turn always stays, clipped if need be
+            if kept == self.max_turns or (kept and used + cost > turn_budget):
+                break
+            kept += 1
+            used += cost
+        return self.turns[: len(self.turns) - kept]
+
+    def fold(self, summary: str, count: int) -> None:
+        """Replace the oldest count turns with summary, which already covers the previous one."""
+        self.summary = summary.strip()
+        del self.turns[:count]
+        self.folded += count
+
+    def render(self) -> str:
+        """Summary and recent turns for the prompt, never over token_budget."""
+        if not self:
+            return NO_HISTORY
+        summary = f"Earlier in this conversation: {_clip(self.summary, self.summary_budget)}" if self.summary else ""
+        remaining = self.token_budget - (estimate_tokens(summary) + 1 if summary else 0)
+        recent: list[str] = []
+        for turn in reversed(self.turns[-self.max_turns:]):
+            text = turn.render()
+            cost = estimate_tokens(text) + 1
+            if cost > remaining:
+                if not recent:
+                    recent.append(_clip(text, remaining - 1))
+                break
+            recent.append(text)
+            remaining -= cost
+        rendered = "\n\n".join(([summary] if summary else []) + recent[::-1])
+        return _clip(rendered, self.token_budget)
+
+    def context(self) -> str:
+        """render(), with its size recorded for budget reporting."""
+        rendered = self.render()
+        tokens = estimate_tokens(rendered) if self else 0
+        self.context_tokens.append(tokens)
+        metrics.CHAT_CONTEXT_TOKENS.observe(tokens)
+        return rendered
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.folded + len(self.turns),
+            "verbatim_turns": len(self.turns),
+            "folded_turns": self.folded,
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0,
+            "token_budget": self.token_budget,
+            "last_context_tokens": self.context_tokens[-1] if self.context_tokens else 0,
+            "max_context_tokens": max(self.context_tokens, default=0),
+        }
+
+
+def chat_memory() -> ConversationMemory:
+    """A new memory sized from BUKID_CHAT_MEMORY_TURNS / BUKID_CHAT_MEMORY_TOKENS."""
+    return ConversationMemory(
+        max_turns=int(os.environ.get("BUKID_CHAT_MEMORY_TURNS", DEFAULT_MAX_TURNS)),
+        token_budget=int(os.environ.get("BUKID_CHAT_MEMORY_TOKENS", DEFAULT_TOKEN_BUDGET)),
+    )
@@ -1,17 +1,34 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task, before_kickoff, after_kickoff
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.utilities.llm_utils import create_llm
 
-from typing import List
+from typing import Iterable, Iterator, List
 from pathlib import Path
 from bukid.models.models import VegetableScheduleOutput, VegetablePreparationOutput, VegetableResearchOutput, ReplantingOutput
+from bukid.models.models import VegetableSchedule, VegetablePreparationItem, PlanningBundleOutput, TranslationOutput
+from bukid.vegetables import split_vegetables, match_items, normalize_name
+from bukid.cache import get_cache, cache_enabled, make_key
+from bukid.semantic_cache import get_answer_index, qa_scope, semantic_cache_enabled
+from bukid.knowledge import knowledge_context
+from bukid.conversation import NO_HISTORY, ConversationMemory, Turn, is_follow_up
+from bukid.admission import get_controller, priority
+from bukid.budgets import budgets_enabled, run_with_budget, stream_with_budget
+from bukid.repair import RepairingConverter
+from bukid.translation import CANONICAL_LANGUAGE, is_canonical, translate_output, translation_enabled
+from bukid import metrics
+import contextvars
+import copy
+import functools
 import json
+import os
+import threading
+import time
 import streamlit as st
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from crewai.tasks.task_output import TaskOutput
-from langchain_anthropic import ChatAnthropic
-
-from crewai_tools import FileReadTool
-claude = ChatAnthropic(model="claude-sonnet-4-5")   #claude-sonnet-4-20250514
+from crewai.types.streaming import StreamChunkType
+from bukid.llm import DEFAULT_MODEL, FAST_MODEL, get_llm
 
 
 
@@ -32,39 +49,56 @@ class Bukid():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    # LLM clients come from bukid.llm so BUKID_LLM_BACKEND=fixture can swap in
+    # recorded responses (see sample_response/fixtures) for offline runs.
     @agent
     def plant_finder(self) -> Agent:
-        #file_read_test = FileReadTool(file_path='./src/bukid/sample_response/plant_finder.txt')
         return Agent(
             config=self.agents_config['plant_finder'], # type: ignore[index]
             verbose=True,
-            llm=claude
-            #tools=[file_read_test]    #SerperDevTool()
+            llm=get_llm(DEFAULT_MODEL)
+            #tools=[SerperDevTool()]
         )
 
     @agent
     def plant_researcher(self) -> Agent:
-        #file_read_test = FileReadTool(file_path='./src/bukid/sample_response/plant_researcher.txt')
         return Agent(
             config=self.agents_config['plant_researcher'], # type: ignore[index]
             verbose=True,
-            llm=claude
-            #tools=[file_read_test]
+            llm=get_llm(DEFAULT_MODEL)
         )
 
     @agent
     def preparation_advisor(self) -> Agent:
-        return Agent(config=self.agents_config["preparation_advisor"], verbose=False)
+        return Agent(config=self.agents_config["preparation_advisor"], verbose=False, llm=get_llm())
 
     @agent
     def garden_assistant(self) -> Agent:
-        return Agent(config=self.agents_config["garden_assistant"], verbose=False)
+        return Agent(config=self.agents_config["garden_assistant"], verbose=False, llm=get_llm())
 
     @agent
     def replanting_advisor(self) -> Agent:
-        return Agent(config=self.agents_config["replanting_advisor"], verbose=False)
+        return Agent(config=self.agents_config["replanting_advisor"], verbose=False, llm=get_llm())
+
+    @agent
+    def garden_planner(self) -> Agent:
+        return Agent(
+            config=self.agents_config['garden_planner'], # type: ignore[index]
+            verbose=False,
+            llm=get_llm(DEFAULT_MODEL)
+        )
+
+    @agent
+    def translator(self) -> Agent:
+        return Agent(config=self.agents_config["translator"], verbose=False, llm=get_llm(FAST_MODEL))
+
+    @agent
+    def conversation_summarizer(self) -> Agent:
+        return Agent(config=self.agents_config["conversation_summarizer"], verbose=False, llm=get_llm(FAST_MODEL))
 
     
+    # Structured outputs go through RepairingConverter, which fixes malformed
+    # JSON locally before crewAI would re-prompt the LLM to re-format it.
     # To learn more about structured task outputs,
     # task dependencies, and task callbacks, check out the documentation:
     # https://docs.crewai.com/concepts/tasks#overview-of-a-task
@@ -75,7 +109,8 @@ class Bukid():
         return Task(
             config=self.tasks_config['plant_finder_task'], # type: ignore[index],
             #callback=lambda output: print("TASK 2 plant_finder_task COMPLETED"),
-            output_pydantic=VegetableResearchOutput
+            output_pydantic=VegetableResearchOutput,
+            converter_cls=RepairingConverter,
         )
 
     @task
@@ -83,7 +118,8 @@ class Bukid():
         print(f"In plant_researcher_task")
         return Task(
             config=self.tasks_config['plant_researcher_task'], # type: ignore[index],
-            output_pydantic=VegetableScheduleOutput
+            output_pydantic=VegetableScheduleOutput,
+            converter_cls=RepairingConverter,
             #callback=lambda output: print("TASK 4 plant_researcher_task COMPLETED") 
         )
 
@@ -91,7 +127,8 @@ class Bukid():
     def preparation_task(self) -> Task:
         return Task(
             config=self.tasks_config["preparation_task"],
-            output_pydantic=VegetablePreparationOutput
+            output_pydantic=VegetablePreparationOutput,
+            converter_cls=RepairingConverter,
         )
         
 
@@ -103,9 +140,30 @@ class Bukid():
     def replanting_task(self) -> Task:
         return Task(
             config=self.tasks_config["replanting_task"],
-            output_pydantic=ReplantingOutput
+            output_pydantic=ReplantingOutput,
+            converter_cls=RepairingConverter,
         )
 
+    @task
+    def planning_bundle_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["planning_bundle_task"],
+            output_pydantic=PlanningBundleOutput,
+            converter_cls=RepairingConverter,
+        )
+
+    @task
+    def translation_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["translation_task"],
+            output_pydantic=TranslationOutput,
+            converter_cls=RepairingConverter,
+        )
+
+    @task
+    def summary_task(self) -> Task:
+        return Task(config=self.tasks_config["summary_task"])
+
 
     @crew
     def research_crew(self) -> Crew:
@@ -154,55 +212,627 @@ class Bukid():
             verbose=False
         )
 
-def run_research(crew_inputs: dict) -> str:
-    inputs = {
+    # ── Research + schedule + preparation in one structured call ──
+    @crew
+    def planning_bundle_crew(self) -> Crew:
+        return Crew(
+            agents=[self.garden_planner()],
+            tasks=[self.planning_bundle_task()],
+            process=Process.sequential,
+            verbose=False
+        )
+
+    # ── Free-text translation of finished results ────────────
+    @crew
+    def translation_crew(self) -> Crew:
+        return Crew(
+            agents=[self.translator()],
+            tasks=[self.translation_task()],
+            process=Process.sequential,
+            verbose=False
+        )
+
+    # ── Running summary of long open chats ───────────────────
+    @crew
+    def summary_crew(self) -> Crew:
+        return Crew(
+            agents=[self.conversation_summarizer()],
+            tasks=[self.summary_task()],
+            process=Process.sequential,
+            verbose=False
+        )
+
+# ── Crew factory ─────────────────────────────────────────────────
+CREW_NAMES = ("research_crew", "schedule_crew", "preparation_crew", "qa_crew", "replanting_crew", "planning_bundle_crew", "translation_crew", "summary_crew")
+
+
+class CrewFactory:
+    """Process-wide source of ready-to-run crews.
+
+    Instantiating Bukid() re-parses agents.yaml/tasks.yaml and rebuilds every
+    agent and task, so that happens once per process. Each crew is then built
+    once as a warm template and callers get a cheap deep copy of it, which
+    kickoff() binds to the request's inputs without touching the template.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bukid = None
+        self._templates: dict[str, Crew] = {}
+
+    def template(self, crew_name: str) -> Crew:
+        with self._lock:
+            if crew_name not in self._templates:
+                if self._bukid is None:
+                    self._bukid = Bukid()
+                self._templates[crew_name] = getattr(self._bukid, crew_name)()
+            return self._templates[crew_name]
+
+    def get(self, crew_name: str, model: str | None = None) -> Crew:
+        """A fresh copy of the crew, optionally with every agent on another model."""
+        crew = self.template(crew_name).copy()
+        for copied in crew.agents:
+            if model is not None:
+                # Agent only runs its llm through create_llm when constructed,
+                # not on assignment, so anything but a crewAI LLM is converted here
+                copied.llm = copy.copy(create_llm(get_llm(model)))
+            # Agent.copy() shallow-copies the LLM, which would keep sharing the
+            # template's token counters and make result.token_usage cumulative
+            if isinstance(getattr(copied.llm, "_token_usage", None), dict):
+                copied.llm._token_usage = dict.fromkeys(copied.llm._token_usage, 0)
+        return crew
+
+    def warm(self, *crew_names: str) -> None:
+        for crew_name in crew_names or CREW_NAMES:
+            self.template(crew_name)
+
+
+crew_factory = CrewFactory()
+
+
+# ── Single-flight ────────────────────────────────────────────────
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight call.
+
+    When a shared link brings many sessions to the same town at once, only the
+    first run_research for it reaches the LLM; the others wait for that call
+    and receive its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def join(self, key: str) -> tuple[Future, bool]:
+        """The future of key's in-flight call and whether the caller leads it.
+
+        A leader settles the future (or cancels it when it gives up) and then
+        calls release(key); everyone else waits on future.result().
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    def do(self, key: str, fn) -> tuple[object, bool]:
+        """Run fn() unless a call with this key is already in flight; returns (value, shared)."""
+        future, leader = self.join(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            value = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            self.release(key)
+
+
+single_flight = SingleFlight()
+
+
+def _record(crew_name: str, inputs: dict, start: float, cache_status: str, crew: Crew | None = None,
+            result=None, error: Exception | None = None) -> None:
+    """Record a crew call in bukid.metrics (latency, tokens, cost, retries, cache status)."""
+    usage = getattr(result, "token_usage", None)
+    llm = crew.agents[0].llm if crew is not None and crew.agents else None
+    metrics.record_kickoff(
+        crew=crew_name,
+        inputs=inputs,
+        wall_s=time.perf_counter() - start,
+        cache=cache_status,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        retries=sum(getattr(task, "retry_count", 0) or 0 for task in crew.tasks) if crew is not None else 0,
+        model=getattr(llm, "model", None),
+        error=repr(error) if error is not None else None,
+    )
+
+
+def _attempt(crew_name: str, inputs: dict, output_model, cache_status: str, settled: threading.Event):
+    """attempt(model, admitted) for bukid.budgets: one recorded kickoff of the crew.
+
+    settled is set once the budgeted call has returned or failed; attempts
+    finishing after that (a losing hedge, a timed-out primary) are recorded as
+    "abandoned", which keeps them out of the p95 that times hedges.
+    """
+    def attempt(model: str | None = None, admitted=lambda: None):
+        attempt_start = time.perf_counter()
+        crew = crew_factory.get(crew_name, model)
+        try:
+            with get_controller().admit(crew=crew_name):
+                admitted()
+                result = crew.kickoff(inputs=inputs)
+        except Exception as e:
+            _record(crew_name, inputs, attempt_start, "abandoned" if settled.is_set() else cache_status, crew, error=e)
+            raise
+        _record(crew_name, inputs, attempt_start, "abandoned" if settled.is_set() else cache_status, crew, result)
+        return result.pydantic if output_model else result.raw
+
+    return attempt
+
+
+def _kickoff(crew_name: str, inputs: dict, output_model=None, refresh: bool = False, accept=None):
+    """Kick off one of the Bukid crews, serving repeated inputs from the response cache.
+
+    refresh=True skips the cached result and replaces it with a fresh one.
+    accept(value), when given, decides whether a result is usable: rejected
+    results are returned but never cached, and a rejected cached entry counts
+    as a miss (and is replaced once the crew gets it right).
+    """
+    start = time.perf_counter()
+    cache = get_cache() if cache_enabled() else None
+    if cache is not None and not refresh:
+        cached = cache.get(crew_name, inputs, output_model)
+        if cached is not None and (accept is None or accept(cached)):
+            _record(crew_name, inputs, start, "hit")
+            return cached
+
+    cache_status = "miss" if cache is not None else "disabled"
+    settled = threading.Event()
+    attempt = _attempt(crew_name, inputs, output_model, cache_status, settled)
+
+    def call():
+        model = None
+        try:
+            if budgets_enabled():
+                value, model = run_with_budget(crew_name, attempt)
+            else:
+                value = attempt()
+        finally:
+            settled.set()
+
+        # Only validated results from the crew's own model are worth keeping;
+        # a fallback-model answer is served once, not for the cache's full TTL
+        if cache is not None and value is not None and model is None and (accept is None or accept(value)):
+            cache.set(crew_name, inputs, value)
+        return value
+
+    value, shared = single_flight.do(make_key(crew_name, inputs), call)
+    if shared:
+        _record(crew_name, inputs, start, "coalesced")
+        # Each session gets its own copy of a shared structured result
+        if value is not None and output_model:
+            value = value.model_copy(deep=True)
+    return value
+
+
+def cache_stats() -> dict:
+    return get_cache().stats()
+
+
+# ── Canonical-language results ───────────────────────────────────
+def _translate_texts(texts: list[str], language: str) -> list[str] | None:
+    inputs = {"language": language, "texts": json.dumps(texts, ensure_ascii=False, indent=2)}
+    # A translation with the wrong number of texts is unusable; caching it would
+    # send every later request for these texts to the fallback run
+    output = _kickoff("translation_crew", inputs, TranslationOutput,
+                      accept=lambda output: len(output.translations) == len(texts))
+    return output.translations if output is not None else None
+
+
+def _canonical_language(run):
+    """Produce a structured result in CANONICAL_LANGUAGE and translate its free text.
+
+    The canonical result is shared (and cached) across languages; only the
+    free-text fields go through the much cheaper translation crew. If the
+    translation doesn't come back one text per input, the crew runs in the
+    user's language as before.
+    """
+    @functools.wraps(run)
+    def wrapper(crew_inputs: dict, *args, **kwargs):
+        language = crew_inputs["language"]
+        if not translation_enabled() or is_canonical(language):
+            return run(crew_inputs, *args, **kwargs)
+        result = run({**crew_inputs, "language": CANONICAL_LANGUAGE}, *args, **kwargs)
+        if result is None:
+            return None
+        translated = translate_output(result, language, _translate_texts)
+        return translated if translated is not None else run(crew_inputs, *args, **kwargs)
+    return wrapper
+
+
+def _research_inputs(crew_inputs: dict) -> dict:
+    return {
         "location": crew_inputs["location"],
         "previous_year": crew_inputs["previous_year"],
         "language": crew_inputs["language"],
         "planting_medium": crew_inputs["planting_medium"]
     }
-    result = Bukid().research_crew().kickoff(inputs)
-    return result.pydantic
 
-
-def run_schedule(crew_inputs: dict, vegetables: str) -> str:
-    print(f"In run_schedule: {crew_inputs}")
-    inputs = {
-        "location": crew_inputs["location"],        # 👈 use dict access
-        "vegetables": vegetables,
-        "language": crew_inputs["language"],
-        "planting_medium": crew_inputs["planting_medium"]
-    }
-    result = Bukid().schedule_crew().kickoff(inputs=inputs)
-    return result.pydantic
+@_canonical_language
+def run_research(crew_inputs: dict) -> VegetableResearchOutput:
+    return _kickoff("research_crew", _research_inputs(crew_inputs), VegetableResearchOutput)
 
 
-def run_preparation(crew_inputs: dict, vegetables: str) -> str:
-    inputs = {
-        "vegetables": vegetables,
+def _vegetable_context(crew_inputs: dict) -> dict:
+    return {
         "location": crew_inputs["location"],
         "language": crew_inputs["language"],
-        "planting_medium": crew_inputs["planting_medium"]
+        "planting_medium": crew_inputs["planting_medium"],
     }
-    result = Bukid().preparation_crew().kickoff(inputs=inputs)
-    return result.pydantic
 
-def run_qa(crew_inputs: dict, question: str) -> str:
-    inputs = {
+
+def _seed_per_vegetable(crew_name: str, crew_inputs: dict, names: list[str], items: list, notes: str = "") -> None:
+    """Store items produced elsewhere (e.g. by the planning bundle) in the per-vegetable cache."""
+    context = _vegetable_context(crew_inputs)
+    matched, _ = match_items(names, items)
+    for name, item in matched.items():
+        get_cache().set(f"{crew_name}:item", {**context, "vegetable": name}, item)
+    if notes:
+        get_cache().set(f"{crew_name}:notes", context, notes)
+
+
+def _run_per_vegetable(crew_name: str, crew_inputs: dict, vegetables: str, output_model, item_model, list_field: str):
+    """Run a per-vegetable crew, only asking the LLM about vegetables that aren't cached yet.
+
+    Each item (a VegetableSchedule or VegetablePreparationItem) is cached by
+    (vegetable, location, planting medium, language). Cache misses go to the
+    crew together as one smaller delta request and the results are merged back
+    into a single output in the order the vegetables were requested.
+    """
+    context = _vegetable_context(crew_inputs)
+    item_namespace = f"{crew_name}:item"
+    names = split_vegetables(vegetables)
+    cache = get_cache() if cache_enabled() else None
+    if cache is None or not names:
+        return _kickoff(crew_name, {**context, "vegetables": vegetables}, output_model)
+
+    items = {}
+    for name in names:
+        cached = cache.get(item_namespace, {**context, "vegetable": name}, item_model)
+        if cached is not None:
+            items[name] = cached
+    missing = [name for name in names if name not in items]
+
+    extras, delta = [], None
+    if missing:
+        delta = _kickoff(crew_name, {**context, "vegetables": "\n".join(missing)}, output_model)
+        if delta is None:
+            return None
+        matched, extras = match_items(missing, getattr(delta, list_field))
+        for name, item in matched.items():
+            cache.set(item_namespace, {**context, "vegetable": name}, item)
+        items.update(matched)
+
+    merged = [items[name] for name in names if name in items]
+    # Keep unrequested extras the model volunteered, unless they repeat a vegetable we already have
+    seen = {normalize_name(item.vegetable) for item in merged}
+    merged += [item for item in extras if normalize_name(item.vegetable) not in seen]
+    extra_fields = {}
+    if "notes" in output_model.model_fields:
+        # General notes are per location/medium, not per vegetable
+        notes_namespace = f"{crew_name}:notes"
+        if delta is not None and delta.notes:
+            cache.set(notes_namespace, context, delta.notes)
+        extra_fields["notes"] = (delta.notes if delta is not None else "") or cache.get(notes_namespace, context) or ""
+    return output_model(**{list_field: merged}, **extra_fields)
+
+
+@_canonical_language
+def run_schedule(crew_inputs: dict, vegetables: str) -> VegetableScheduleOutput:
+    print(f"In run_schedule: {crew_inputs}")
+    return _run_per_vegetable("schedule_crew", crew_inputs, vegetables, VegetableScheduleOutput, VegetableSchedule, "vegetable_schedule")
+
+
+@_canonical_language
+def run_preparation(crew_inputs: dict, vegetables: str) -> VegetablePreparationOutput:
+    return _run_per_vegetable("preparation_crew", crew_inputs, vegetables, VegetablePreparationOutput, VegetablePreparationItem, "vegetable_preparation")
+
+def planning_bundle_enabled() -> bool:
+    return os.environ.get("BUKID_PLANNING_BUNDLE", "").lower() in ("1", "true", "yes")
+
+
+@_canonical_language
+def run_planning_bundle(crew_inputs: dict) -> PlanningBundleOutput:
+    """Research, schedule and preparation for the planning flow in one structured LLM call.
+
+    The pieces are also written to the research and per-vegetable caches, so
+    later run_research/run_schedule/run_preparation calls for the same
+    vegetables are answered locally.
+    """
+    inputs = _research_inputs(crew_inputs)
+    bundle = _kickoff("planning_bundle_crew", inputs, PlanningBundleOutput)
+    if bundle is not None and cache_enabled():
+        names = [v.vegetable for v in bundle.research.vegetable_recommendations]
+        get_cache().set("research_crew", inputs, bundle.research)
+        _seed_per_vegetable("schedule_crew", crew_inputs, names, bundle.schedule.vegetable_schedule)
+        _seed_per_vegetable("preparation_crew", crew_inputs, names,
+                            bundle.preparation.vegetable_preparation, bundle.preparation.notes)
+    return bundle
+
+def _standalone(question: str, memory: ConversationMemory | None) -> bool:
+    """Whether the question can be answered (and its answer reused) without the conversation."""
+    return not memory or not is_follow_up(question)
+
+
+def _qa_inputs(crew_inputs: dict, question: str, memory: ConversationMemory | None = None) -> dict:
+    # Follow-ups look up notes with the question they follow up on
+    query = question if _standalone(question, memory) else f"{memory.last_question()} {question}"
+    if memory is not None:
+        _apply_summary(memory)
+    return {
         "question": question,
         "location": crew_inputs["location"],
         "language": crew_inputs["language"],
-        "planting_medium": crew_inputs["planting_medium"]
+        "planting_medium": crew_inputs["planting_medium"],
+        "context": knowledge_context(query),
+        "history": memory.context() if memory is not None else NO_HISTORY,
     }
-    result = Bukid().qa_crew().kickoff(inputs=inputs)
-    return result.raw
 
+def _answer_index():
+    return get_answer_index() if cache_enabled() and semantic_cache_enabled() else None
+
+
+def _similar_answer(inputs: dict) -> str | None:
+    """Answer to an earlier, near-identical question asked in the same scope, if any."""
+    index = _answer_index()
+    if index is None:
+        return None
+    start = time.perf_counter()
+    match = index.lookup(qa_scope(inputs), inputs["question"])
+    if match is None:
+        return None
+    _record("qa_crew", inputs, start, "semantic")
+    return match[0]
+
+
+def _remember_answer(inputs: dict, answer: str) -> None:
+    index = _answer_index()
+    if index is not None and answer:
+        index.add(qa_scope(inputs), inputs["question"], answer)
+
+
+# ── Open-chat memory ─────────────────────────────────────────────
+def _summarize_turns(summary: str, turns: list[Turn], language: str) -> str | None:
+    inputs = {
+        "summary": summary or "(nothing yet)",
+        "turns": "\n\n".join(turn.render() for turn in turns),
+        "language": language,
+    }
+    return _kickoff("summary_crew", inputs)
+
+
+def _apply_summary(memory: ConversationMemory) -> None:
+    """Fold in a background summary once it has finished."""
+    if memory.summarizing is None or not memory.summarizing[0].done():
+        return
+    future, count = memory.summarizing
+    memory.summarizing = None
+    # On failure the turns stay verbatim and the next turn tries again
+    if future.exception() is None and future.result():
+        memory.fold(future.result(), count)
+        metrics.CHAT_FOLDS.inc(count)
+
+
+def remember_turn(memory: ConversationMemory | None, crew_inputs: dict, question: str, answer: str) -> None:
+    """Add a chat turn to memory and start folding turns that left the verbatim window."""
+    if memory is None or not answer:
+        return
+    memory.add(question, answer)
+    _apply_summary(memory)
+    older = memory.to_fold()
+    if older and memory.summarizing is None:
+        # Summaries can wait behind anything a user is waiting on
+        with priority("background"):
+            future = submit(_summarize_turns, memory.summary, older, crew_inputs["language"])
+        memory.summarizing = (future, len(older))
+
+
+def run_qa(crew_inputs: dict, question: str, refresh: bool = False, memory: ConversationMemory | None = None) -> str:
+    """Answer an open-chat question; refresh=True asks the crew again instead of reusing an answer.
+
+    With a memory, the question is answered in the context of the conversation
+    so far and the turn is added to it.
+    """
+    inputs = _qa_inputs(crew_inputs, question, memory)
+    standalone = _standalone(question, memory)
+    answer = _similar_answer(inputs) if standalone and not refresh else None
+    if answer is None:
+        with priority("interactive"):
+            answer = _kickoff("qa_crew", inputs, refresh=refresh)
+        if standalone:
+            _remember_answer(inputs, answer)
+    remember_turn(memory, crew_inputs, question, answer)
+    return answer
+
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+def _final_answer_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Drop the agent's 'Thought: ...' preamble and pass through everything after 'Final Answer:'."""
+    buffer = ""
+    for chunk in chunks:
+        if buffer is None:
+            yield chunk
+            continue
+        buffer += chunk
+        marker_at = buffer.find(FINAL_ANSWER_MARKER)
+        if marker_at != -1:
+            answer = buffer[marker_at + len(FINAL_ANSWER_MARKER):].lstrip()
+            buffer = None
+            if answer:
+                yield answer
+    if buffer:
+        # The model answered without the ReAct preamble
+        yield buffer
+
+def stream_qa(crew_inputs: dict, question: str, refresh: bool = False, memory: ConversationMemory | None = None) -> Iterator[str]:
+    """Yield the garden_assistant's answer as it is generated, for st.write_stream.
+
+    Answers to near-identical earlier questions are yielded whole; refresh=True
+    streams a fresh answer instead. With a memory, the question is answered in
+    the context of the conversation so far and the turn is added to it.
+
+    The stream runs within qa_crew's latency budget (BudgetExceeded past it).
+    Sessions asking the same question while it streams get the finished
+    answer in one piece instead of a kickoff of their own.
+    """
+    inputs = _qa_inputs(crew_inputs, question, memory)
+    standalone = _standalone(question, memory)
+    if standalone and not refresh:
+        answer = _similar_answer(inputs)
+        if answer is not None:
+            remember_turn(memory, crew_inputs, question, answer)
+            yield answer
+            return
+
+    start = time.perf_counter()
+    cache = get_cache() if cache_enabled() else None
+    if cache is not None and not refresh:
+        cached = cache.get("qa_crew", inputs)
+        if cached is not None:
+            _record("qa_crew", inputs, start, "hit")
+            remember_turn(memory, crew_inputs, question, cached)
+            yield cached
+            return
+
+    key = make_key("qa_crew", inputs)
+    shared, leader = single_flight.join(key)
+    if not leader:
+        try:
+            answer = shared.result()
+        except CancelledError:
+            # The session streaming it went away before the answer was done
+            with priority("interactive"):
+                answer = _kickoff("qa_crew", inputs, refresh=refresh)
+        else:
+            _record("qa_crew", inputs, start, "coalesced")
+        remember_turn(memory, crew_inputs, question, answer)
+        yield answer
+        return
+
+    cache_status = "miss" if cache is not None else "disabled"
+    settled = threading.Event()
+
+    def stream(admitted):
+        crew = crew_factory.get("qa_crew")
+        crew.stream = True
+        attempt_start = time.perf_counter()
+        try:
+            # The slot is held until the stream is drained
+            with get_controller().admit("interactive", crew="qa_crew"):
+                admitted()
+                streaming = crew.kickoff(inputs=inputs)
+                yield from _final_answer_chunks(
+                    chunk.content for chunk in streaming if chunk.chunk_type == StreamChunkType.TEXT
+                )
+                result = streaming.result
+        except Exception as e:
+            _record("qa_crew", inputs, attempt_start, "abandoned" if settled.is_set() else cache_status, crew, error=e)
+            raise
+        _record("qa_crew", inputs, attempt_start, "abandoned" if settled.is_set() else cache_status, crew, result)
+        return result.raw
+
+    def fallback(model, admitted):
+        with priority("interactive"):
+            return attempt(model, admitted)
+
+    attempt = _attempt("qa_crew", inputs, None, cache_status, settled)
+    try:
+        try:
+            if budgets_enabled():
+                answer, model = yield from stream_with_budget("qa_crew", stream, fallback)
+            else:
+                answer, model = (yield from stream(lambda: None)), None
+        finally:
+            settled.set()
+    except GeneratorExit:
+        shared.cancel()
+        raise
+    except BaseException as e:
+        shared.set_exception(e)
+        raise
+    else:
+        shared.set_result(answer)
+    finally:
+        single_flight.release(key)
+
+    # As in _kickoff, a fallback-model answer is served but not cached
+    if cache is not None and answer and model is None:
+        cache.set("qa_crew", inputs, answer)
+    if standalone:
+        _remember_answer(inputs, answer)
+    remember_turn(memory, crew_inputs, question, answer)
+
+@_canonical_language
 def run_replanting(crew_inputs: dict, harvested_vegetable: str) -> ReplantingOutput:
     inputs = {
         "harvested_vegetable": harvested_vegetable,
         "location": crew_inputs["location"],
         "language": crew_inputs["language"],
-        "planting_medium": crew_inputs["planting_medium"]
+        "planting_medium": crew_inputs["planting_medium"],
+        "context": knowledge_context(f"{harvested_vegetable} crop rotation replanting after harvest"),
+    }
+    return _kickoff("replanting_crew", inputs, ReplantingOutput)
+
+
+# ── Parallel orchestration ───────────────────────────────────────
+# Crew kickoffs are I/O bound (waiting on the LLM), so a small thread pool
+# lets independent crews run side by side without blocking the Streamlit script.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("BUKID_CREW_WORKERS", 4)),
+    thread_name_prefix="bukid-crew",
+)
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """Run any of the run_* helpers in the background and return its future."""
+    # Carry the caller's context (e.g. its admission priority) into the worker thread
+    return _executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _resolved(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def start_planning(crew_inputs: dict, vegetables: str, bundle: PlanningBundleOutput | None = None) -> dict[str, Future]:
+    """Start the schedule and preparation crews together once the vegetable list is final.
+
+    Both crews only depend on crew_inputs and the vegetable list, so there is no
+    reason to wait for one before starting the other. Call .result() on the
+    returned futures when the UI needs each output. If a planning bundle already
+    covers exactly these vegetables, its pieces are returned as resolved futures.
+    """
+    if bundle is not None:
+        bundled = [normalize_name(v.vegetable) for v in bundle.research.vegetable_recommendations]
+        if bundled == [normalize_name(name) for name in split_vegetables(vegetables)]:
+            return {"schedule": _resolved(bundle.schedule), "preparation": _resolved(bundle.preparation)}
+
+    crew_inputs = dict(crew_inputs)
+    return {
+        "schedule": submit(run_schedule, crew_inputs, vegetables),
+        "preparation": submit(run_preparation, crew_inputs, vegetables),
     }
-    result = Bukid().replanting_crew().kickoff(inputs=inputs)
-    return result.pydantic
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""Crop catalog: canonical crops behind the many names a vegetable goes by.
+
+The research and schedule crews return crop names as free text ("Kangkong
+(Water Spinach)", "Siling Labuyo", "tomatoes"). find() maps such a name onto
+a bundled catalog (config/crops.json) of crops with Tagalog and English
+aliases and seed varieties, and returns a Crop with a stable ID and what the
+charts and the garden designer need about it: days to harvest, emoji,
+family and spacing.
+
+Aliases are compiled into a character trie. A lookup walks the trie from
+each word of the name, so it costs time in the length of the name, not the
+size of the catalog, and the longest alias in the name wins ("chinese
+cabbage" over "cabbage"). Names with no alias in them go through a trigram
+index that narrows a fuzzy match down to a few candidates, which keeps typo
+lookups fast on catalogs with thousands of varieties.
+"""
+import difflib
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+CATALOG_PATH = Path(__file__).resolve().parent / "config" / "crops.json"
+# Days from seed to first harvest for crops the catalog has no figure for
+DEFAULT_DAYS_TO_HARVEST = (60, 90)
+DEFAULT_EMOJI = "🌱"
+FUZZY_CUTOFF = 0.8
+# Aliases sharing the most trigrams with the name that get a full similarity check
+FUZZY_CANDIDATES = 8
+
+_END = ""  # trie key holding the crop ID of an alias ending at that node
+
+
+@dataclass(frozen=True)
+class Crop:
+    id: str
+    name: str
+    tagalog: str
+    family: str
+    days_to_harvest: Optional[tuple[int, int]]
+    emoji: str
+    spacing_cm: Optional[int]
+
+
+def _singular(token: str) -> str:
+    if len(token) > 4 and token.endswith("oes"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_crop_name(text: str) -> str:
+    """'Tomatoes (Kamatis)' -> 'tomato kamati'; aliases and names go through the same steps."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(_singular(token) for token in re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CropCatalog:
+    """Alias trie, exact alias table and trigram index over a crop catalog file."""
+
+    def __init__(self, path: Path | str = CATALOG_PATH):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.crops: dict[str, Crop] = {}
+        # alias -> crop ID, first crop listing an alias wins
+        self._aliases: dict[str, str] = {}
+        self._trie: dict = {}
+        self._trigram_index: dict[str, list[str]] = {}
+
+        for entry in data["crops"]:
+            days = entry.get("days_to_harvest")
+            crop = Crop(
+                id=entry["id"],
+                name=entry["name"],
+                tagalog=entry.get("tagalog", entry["name"]),
+                family=entry.get("family", ""),
+                days_to_harvest=tuple(days) if days else None,
+                emoji=entry.get("emoji", DEFAULT_EMOJI),
+                spacing_cm=entry.get("spacing_cm"),
+            )
+            self.crops[crop.id] = crop
+            names = [crop.name, crop.tagalog, crop.id.replace("-", " "),
+                     *entry.get("aliases", []), *entry.get("varieties", [])]
+            for name in names:
+                alias = normalize_crop_name(name)
+                if alias and alias not in self._aliases:
+                    self._aliases[alias] = crop.id
+                    self._insert(alias, crop.id)
+
+        for alias in self._aliases:
+            for trigram in _trigrams(alias):
+                self._trigram_index.setdefault(trigram, []).append(alias)
+
+    def _insert(self, alias: str, crop_id: str) -> None:
+        node = self._trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[_END] = crop_id
+
+    def _scan(self, text: str) -> Optional[str]:
+        """Crop ID of the longest alias found in text, starting and ending at word boundaries."""
+        best, best_length = None, 0
+        for start in range(len(text)):
+            if start and text[start - 1] != " ":
+                continue
+            node = self._trie
+            for end in range(start, len(text) + 1):
+                if _END in node and (end == len(text) or text[end] == " ") and end - start > best_length:
+                    best, best_length = node[_END], end - start
+                if end == len(text) or text[end] not in node:
+                    break
+                node = node[text[end]]
+        return best
+
+    def _fuzzy(self, text: str) -> Optional[str]:
+        """Crop ID of the alias closest to text, among those sharing the most trigrams with it."""
+        shared: Counter = Counter()
+        for trigram in _trigrams(text):
+            shared.update(self._trigram_index.get(trigram, ()))
+        best, best_ratio = None, FUZZY_CUTOFF
+        matcher = difflib.SequenceMatcher(b=text)
+        for alias, _ in shared.most_common(FUZZY_CANDIDATES):
+            matcher.set_seq1(alias)
+            # Cheap upper bounds first; most candidates never need the full ratio
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = alias, ratio
+        return self._aliases[best] if best else None
+
+    def find(self, name: str) -> Optional[Crop]:
+        text = normalize_crop_name(name)
+        if not text:
+            return None
+        crop_id = self._aliases.get(text) or self._scan(text) or self._fuzzy(text)
+        return self.crops[crop_id] if crop_id else None
+
+    def __len__(self) -> int:
+        return len(self.crops)
+
+    def stats(self) -> dict:
+        return {"crops": len(self.crops), "aliases": len(self._aliases), "trigrams": len(self._trigram_index)}
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> CropCatalog:
+    """Process-wide catalog, from BUKID_CROP_CATALOG_PATH when set."""
+    return CropCatalog(os.environ.get("BUKID_CROP_CATALOG_PATH", CATALOG_PATH))
+
+
+@lru_cache(maxsize=4096)
+def find_crop(name: str) -> Optional[Crop]:
+    """Catalog crop for a free-text vegetable name, or None when nothing matches."""
+    return get_catalog().find(name)
+
+
+def days_to_harvest(name: str) -> tuple[int, int]:
+    """(min_days, max_days) from seed to first harvest, falling back to a sensible default."""
+    crop = find_crop(name)
+    return crop.days_to_harvest if crop and crop.days_to_harvest else DEFAULT_DAYS_TO_HARVEST
+
+
+def crop_emoji(name: str) -> str:
+    crop = find_crop(name)
+    return crop.emoji if crop else DEFAULT_EMOJI
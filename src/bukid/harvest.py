@@ -0,0 +1,94 @@
+"""Harvest windows for a table of plantings.
+
+A planting is one sowing of a crop: a crop name, the date it went in, and
+optionally the bed it is in and how many plants. The same crop can be planted
+many times (succession sowings, several beds), and community-garden accounts
+track thousands of plantings, so harvest_windows() works on the whole table
+at once: crop names are resolved once per distinct name against the crop
+catalog, and harvest dates, status buckets and countdowns are computed as
+column operations rather than per planting.
+"""
+from datetime import date
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from bukid.crops import days_to_harvest, find_crop
+
+# Days before the harvest window opens that count as "soon"
+SOON_DAYS = 14
+STATUSES = ("ready", "past", "soon", "later")
+
+PLANTING_COLUMNS = ["crop", "planted", "bed", "quantity"]
+
+
+def plantings_frame(plantings: Iterable[Mapping] = ()) -> pd.DataFrame:
+    """DataFrame of plantings from dicts with crop, planted and optional bed/quantity."""
+    plantings = list(plantings)
+    return pd.DataFrame({
+        "crop": np.array([p["crop"] for p in plantings], dtype=object),
+        "planted": np.array([p["planted"] for p in plantings], dtype="datetime64[D]"),
+        "bed": np.array([p.get("bed") or "" for p in plantings], dtype=object),
+        "quantity": np.array([p.get("quantity") or 1 for p in plantings], dtype=np.int64),
+    })
+
+
+def plantings_from_dates(planted_dates: Mapping, order: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Plantings from {crop: [plantings]}, as the planting-dates form stores them.
+
+    Each planting is a dict with planted and optional bed/quantity, or just its
+    date; a single date or dict stands for a one-item list. Several plantings
+    of a crop are succession sowings or other beds. Crops follow order (the
+    schedule's) when given, and each crop's plantings are by date.
+    """
+    crops = list(order) if order is not None else list(planted_dates)
+    rows = []
+    for crop in crops:
+        plantings = planted_dates.get(crop)
+        if not plantings:
+            continue
+        if not isinstance(plantings, (list, tuple)):
+            plantings = [plantings]
+        plantings = [p if isinstance(p, Mapping) else {"planted": p} for p in plantings]
+        for planting in sorted(plantings, key=lambda p: p["planted"]):
+            rows.append({**planting, "crop": crop})
+    return plantings_frame(rows)
+
+
+def harvest_windows(plantings: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """plantings with crop_id, min/max days, harvest_early/late, days_left and status columns added.
+
+    status is "ready" (inside the harvest window), "past" (window closed),
+    "soon" (opens within SOON_DAYS) or "later".
+    """
+    today = np.datetime64(today or date.today(), "D")
+
+    # One catalog lookup per distinct crop name, then spread over the plantings
+    codes, names = pd.factorize(plantings["crop"].to_numpy(dtype=object))
+    crop_ids = np.array([getattr(find_crop(name), "id", "") for name in names], dtype=object)
+    days = np.array([days_to_harvest(name) for name in names], dtype=np.int64).reshape(-1, 2)
+    min_days, max_days = days[codes, 0], days[codes, 1]
+
+    planted = plantings["planted"].to_numpy(dtype="datetime64[D]")
+    harvest_early = planted + min_days.astype("timedelta64[D]")
+    harvest_late = planted + max_days.astype("timedelta64[D]")
+    days_left = (harvest_early - today).astype(np.int64)
+    status = np.select(
+        [harvest_late < today, days_left <= 0, days_left <= SOON_DAYS],
+        ["past", "ready", "soon"],
+        default="later",
+    ).astype(object)
+
+    # Built as one frame: adding columns to plantings one at a time costs more than the math
+    windows = pd.DataFrame({
+        "crop_id": crop_ids[codes], "min_days": min_days, "max_days": max_days,
+        "harvest_early": harvest_early, "harvest_late": harvest_late, "days_left": days_left, "status": status,
+    }, index=plantings.index)
+    return pd.concat([plantings, windows], axis=1)
+
+
+def status_counts(windows: pd.DataFrame) -> dict[str, int]:
+    """Plantings per status bucket, every bucket present."""
+    counts = windows["status"].value_counts()
+    return {status: int(counts.get(status, 0)) for status in STATUSES}
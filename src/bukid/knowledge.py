@@ -0,0 +1,251 @@
+"""Local retrieval over the documents in knowledge/ for the QA and replanting prompts.
+
+Documents (.md and .txt) are split into chunks, one per markdown section with
+long sections split at paragraph breaks, and indexed for BM25 ranking. Chunk
+terms are persisted to SQLite next to the response cache. On startup only
+documents whose content hash changed are re-chunked; everything else is
+loaded straight from disk. Queries return the top-k snippets, which are
+injected into the task prompt instead of leaving the agent to answer purely
+from model recall.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from bukid import metrics
+from bukid.semantic_cache import tokenize
+
+
+KNOWLEDGE_DIR = Path(__file__).resolve().parents[2] / "knowledge"
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[2] / ".cache" / "knowledge.sqlite3"
+DOCUMENT_SUFFIXES = (".md", ".txt")
+DEFAULT_TOP_K = 3
+MAX_CHUNK_WORDS = 150
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+# A term in the section heading counts as this many occurrences in the text
+HEADING_WEIGHT = 3
+# Snippets scoring below this share too little with the query to be worth the tokens
+MIN_SCORE = 2.0
+
+
+@dataclass(frozen=True)
+class Snippet:
+    source: str
+    title: str
+    text: str
+    score: float
+
+
+def chunk_document(text: str, title: str) -> list[tuple[str, str]]:
+    """(heading, text) chunks: one per markdown section, split at paragraphs past MAX_CHUNK_WORDS."""
+    chunks: list[tuple[str, str]] = []
+    heading, paragraphs, words = title, [], 0
+
+    def flush() -> None:
+        nonlocal paragraphs, words
+        if paragraphs:
+            chunks.append((heading, "\n\n".join(paragraphs)))
+        paragraphs, words = [], 0
+
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if block.startswith("#"):
+            flush()
+            first_line, _, block = block.partition("\n")
+            heading = first_line.lstrip("#").strip() or title
+            block = block.strip()
+        if not block:
+            continue
+        size = len(block.split())
+        if paragraphs and words + size > MAX_CHUNK_WORDS:
+            flush()
+        paragraphs.append(block)
+        words += size
+    flush()
+    return chunks
+
+
+def _chunk_terms(heading: str, text: str) -> Counter:
+    terms = Counter(tokenize(text))
+    for term in tokenize(heading):
+        terms[term] += HEADING_WEIGHT
+    return terms
+
+
+class KnowledgeIndex:
+    """BM25 index over the chunks of a directory of documents, persisted to SQLite."""
+
+    def __init__(self, directory: Path | str = KNOWLEDGE_DIR, path: Path | str = DEFAULT_INDEX_PATH):
+        self.directory = Path(directory)
+        self.path = Path(path)
+        self.build_seconds = 0.0
+        self.reindexed = 0
+
+        # (source, title, text, term counts, length)
+        self._chunks: list[tuple[str, str, str, Counter, int]] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._avg_length = 0.0
+
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS knowledge_documents (
+                source      TEXT PRIMARY KEY,
+                sha256      TEXT NOT NULL,
+                indexed_at  REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS knowledge_chunks (
+                id      INTEGER PRIMARY KEY,
+                source  TEXT NOT NULL,
+                title   TEXT NOT NULL,
+                text    TEXT NOT NULL,
+                terms   TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS knowledge_chunks_source ON knowledge_chunks (source);
+            """
+        )
+        self._conn.commit()
+        self.refresh()
+
+    # ── Building ──────────────────────────────────────────────────
+    def _documents(self) -> dict[str, str]:
+        if not self.directory.is_dir():
+            return {}
+        return {
+            file.relative_to(self.directory).as_posix(): file.read_text(encoding="utf-8")
+            for file in sorted(self.directory.rglob("*"))
+            if file.is_file() and file.suffix.lower() in DOCUMENT_SUFFIXES
+        }
+
+    def refresh(self) -> int:
+        """Re-chunk documents added or changed since the last build; returns how many were."""
+        start = time.perf_counter()
+        documents = self._documents()
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT source, sha256 FROM knowledge_documents"))
+            reindexed = 0
+            for source, text in documents.items():
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if stored.get(source) == digest:
+                    continue
+                self._conn.execute("DELETE FROM knowledge_chunks WHERE source = ?", (source,))
+                title = Path(source).stem.replace("_", " ").capitalize()
+                self._conn.executemany(
+                    "INSERT INTO knowledge_chunks (source, title, text, terms) VALUES (?, ?, ?, ?)",
+                    [
+                        (source, heading, chunk, json.dumps(_chunk_terms(heading, chunk)))
+                        for heading, chunk in chunk_document(text, title)
+                    ],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO knowledge_documents (source, sha256, indexed_at) VALUES (?, ?, ?)",
+                    (source, digest, time.time()),
+                )
+                reindexed += 1
+            for source in stored.keys() - documents.keys():
+                self._conn.execute("DELETE FROM knowledge_chunks WHERE source = ?", (source,))
+                self._conn.execute("DELETE FROM knowledge_documents WHERE source = ?", (source,))
+            self._conn.commit()
+            self._load()
+        self.reindexed = reindexed
+        self.build_seconds = time.perf_counter() - start
+        return reindexed
+
+    def _load(self) -> None:
+        """Rebuild the in-memory postings from the stored chunks (caller holds the lock)."""
+        self._chunks, self._postings = [], {}
+        rows = self._conn.execute("SELECT source, title, text, terms FROM knowledge_chunks ORDER BY id")
+        for source, title, text, terms in rows:
+            counts = Counter(json.loads(terms))
+            chunk_id = len(self._chunks)
+            self._chunks.append((source, title, text, counts, sum(counts.values())))
+            for term, count in counts.items():
+                self._postings.setdefault(term, []).append((chunk_id, count))
+        self._avg_length = sum(chunk[4] for chunk in self._chunks) / len(self._chunks) if self._chunks else 0.0
+
+    # ── Queries ───────────────────────────────────────────────────
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K, min_score: float = MIN_SCORE) -> list[Snippet]:
+        """The top_k chunks by BM25 score, leaving out those below min_score."""
+        start = time.perf_counter()
+        with self._lock:
+            n = len(self._chunks)
+            scores: Counter = Counter()
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term, ())
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, count in postings:
+                    length = self._chunks[chunk_id][4]
+                    norm = K1 * (1 - B + B * length / self._avg_length)
+                    scores[chunk_id] += idf * count * (K1 + 1) / (count + norm)
+            snippets = [
+                Snippet(*self._chunks[chunk_id][:3], score=score)
+                for chunk_id, score in scores.most_common(top_k)
+                if score >= min_score
+            ]
+        metrics.KNOWLEDGE_QUERY.observe(time.perf_counter() - start)
+        return snippets
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def stats(self) -> dict:
+        (documents,) = self._conn.execute("SELECT COUNT(*) FROM knowledge_documents").fetchone()
+        return {
+            "documents": documents,
+            "chunks": len(self),
+            "terms": len(self._postings),
+            "reindexed": self.reindexed,
+            "build_seconds": self.build_seconds,
+        }
+
+
+def format_snippets(snippets: list[Snippet]) -> str:
+    """Snippets as a prompt block; a placeholder line when nothing matched."""
+    if not snippets:
+        return "(no relevant notes)"
+    return "\n\n".join(f"[{snippet.title}]\n{snippet.text}" for snippet in snippets)
+
+
+_index: Optional[KnowledgeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """Process-wide index, configured from BUKID_KNOWLEDGE_DIR / BUKID_KNOWLEDGE_INDEX_PATH."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KnowledgeIndex(
+                directory=os.environ.get("BUKID_KNOWLEDGE_DIR", KNOWLEDGE_DIR),
+                path=os.environ.get("BUKID_KNOWLEDGE_INDEX_PATH", DEFAULT_INDEX_PATH),
+            )
+        return _index
+
+
+def knowledge_enabled() -> bool:
+    return os.environ.get("BUKID_KNOWLEDGE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def knowledge_context(query: str) -> str:
+    """Prompt block with the notes most relevant to query (BUKID_KNOWLEDGE_TOP_K of them)."""
+    if not knowledge_enabled():
+        return format_snippets([])
+    top_k = int(os.environ.get("BUKID_KNOWLEDGE_TOP_K", DEFAULT_TOP_K))
+    return format_snippets(get_knowledge_index().search(query, top_k=top_k))
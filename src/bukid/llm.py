@@ -0,0 +1,147 @@
+"""LLM backend selection for the Bukid agents.
+
+BUKID_LLM_BACKEND picks where completions come from:
+
+- ``anthropic`` (default): Claude through crewAI's Anthropic LLM, as in production.
+- ``fixture``: recorded responses from ``sample_response/fixtures``, served
+  with configurable artificial latency, so every crew (and the whole
+  Streamlit flow) runs with no network or API key.
+"""
+import os
+import time
+from contextlib import nullcontext
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from crewai.llms.base_llm import llm_call_context
+except ImportError:  # older crewAI releases don't scope events per call
+    llm_call_context = nullcontext
+
+
+DEFAULT_MODEL = "claude-sonnet-4-5"   #claude-sonnet-4-20250514
+# Smaller model for mechanical passes such as translating finished results
+FAST_MODEL = "claude-haiku-4-5"
+FIXTURE_DIR = Path(__file__).resolve().parent / "sample_response" / "fixtures"
+BACKENDS = ("anthropic", "fixture")
+
+
+def backend_name() -> str:
+    return os.environ.get("BUKID_LLM_BACKEND", "anthropic").strip().lower()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for fixture usage accounting."""
+    return max(1, len(text) // 4)
+
+
+class FixtureLLM(BaseLLM):
+    """Deterministic offline LLM that replays recorded responses.
+
+    The response is chosen by the calling task's name (e.g. ``qa_task`` reads
+    ``qa_task.txt``), falling back to ``default.txt``. ``latency`` is slept
+    once per call; when streaming, ``token_latency`` is slept per chunk so
+    time-to-first-token behaves like a real provider.
+    """
+
+    llm_type: str = "fixture"
+    stream: bool = False
+
+    def __init__(
+        self,
+        model: str = "fixture",
+        fixture_dir: str = str(FIXTURE_DIR),
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        **kwargs: Any,
+    ) -> None:
+        # crewAI's BaseLLM is a plain class, so the fixture settings are set
+        # here rather than declared as model fields
+        super().__init__(model=model, **kwargs)
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.token_latency = token_latency
+
+    def call(
+        self,
+        messages: str | list[dict[str, Any]],
+        tools: list[dict] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        from_task: Any | None = None,
+        from_agent: Any | None = None,
+        **kwargs: Any,
+    ) -> str:
+        response = self.response_for(getattr(from_task, "name", None))
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.stream:
+            with llm_call_context():
+                for chunk in response.split(" "):
+                    if self.token_latency:
+                        time.sleep(self.token_latency)
+                    self._emit_stream_chunk_event(chunk=chunk + " ", from_task=from_task, from_agent=from_agent)
+
+        prompt = messages if isinstance(messages, str) else "".join(str(m.get("content", "")) for m in messages)
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(response)
+        self._track_token_usage_internal({
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })
+        return response
+
+    def response_for(self, task_name: str | None) -> str:
+        answer = _read_fixture(self.fixture_dir, task_name or "default")
+        if "Final Answer:" in answer:
+            return answer
+        # Agents parse the ReAct format, so wrap plain recorded answers in it
+        return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 200_000
+
+
+@lru_cache(maxsize=None)
+def _read_fixture(fixture_dir: str, name: str) -> str:
+    directory = Path(fixture_dir)
+    for candidate in (f"{name}.json", f"{name}.txt", "default.txt"):
+        path = directory / candidate
+        if path.exists():
+            return path.read_text(encoding="utf-8").strip()
+    raise FileNotFoundError(f"No fixture for '{name}' in {directory}")
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str | None = None) -> Any:
+    """Shared LLM client for agents, built on first use for the configured backend.
+
+    With the anthropic backend, ``model=None`` returns None so the agent falls
+    back to crewAI's default model (the MODEL environment variable).
+    """
+    backend = backend_name()
+    if backend == "fixture":
+        return FixtureLLM(
+            model="fixture",
+            fixture_dir=os.environ.get("BUKID_FIXTURE_DIR", str(FIXTURE_DIR)),
+            latency=float(os.environ.get("BUKID_FIXTURE_LATENCY", 0)),
+            token_latency=float(os.environ.get("BUKID_FIXTURE_TOKEN_LATENCY", 0)),
+        )
+    if backend == "anthropic":
+        if model is None:
+            return None
+        # A crewAI LLM, not a langchain client: agents call llm.call(), and one
+        # assigned after construction (a fallback model) is not converted for them
+        from crewai import LLM
+        return LLM(model=f"anthropic/{model}")
+    raise ValueError(f"Unknown BUKID_LLM_BACKEND '{backend}', expected one of {BACKENDS}")
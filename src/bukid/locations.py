@@ -0,0 +1,182 @@
+"""Canonical Philippine locations for free-text garden locations.
+
+Users type "Sta. Rosa, Laguna", "Santa Rosa Laguna" or "sta rosa, laguna" for
+the same place. resolve() maps such text onto a bundled index of provinces and common
+cities/municipalities (config/ph_locations.json) and returns a Location with a
+stable ID and the province's PAGASA climate type, so caches key on the place
+rather than on the spelling. Text outside the index resolves to None and is
+used as typed.
+"""
+import difflib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+INDEX_PATH = Path(__file__).resolve().parent / "config" / "ph_locations.json"
+
+# Abbreviations expanded before lookup ("Sta. Rosa" -> "santa rosa")
+ABBREVIATIONS = {"sta": "santa", "sto": "santo", "sn": "san", "gen": "general", "mt": "mountain", "prov": "province"}
+# Tokens that never change which place is meant
+NOISE_TOKENS = {"philippines", "philippine", "pilipinas", "ph", "phl", "province", "of", "the", "municipality"}
+# Tokens that mark the street or barangay part of an address; only what follows them may be skipped
+ADDRESS_MARKERS = {"barangay", "brgy", "bgy", "brg", "purok", "sitio", "zone", "street", "st", "avenue", "ave",
+                   "road", "rd", "highway", "subdivision", "subd", "village", "block", "blk", "lot"}
+FUZZY_CUTOFF = 0.8
+
+
+@dataclass(frozen=True)
+class Location:
+    id: str
+    name: str
+    province: str
+    region: str
+    climate_zone: str
+
+    @property
+    def display_name(self) -> str:
+        if self.name == self.province:
+            return f"{self.name}, Philippines"
+        return f"{self.name}, {self.province}, Philippines"
+
+
+def normalize_text(text: str) -> str:
+    """'Sta. Rosa, Laguna (PH)' -> 'santa rosa laguna'"""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    return " ".join(ABBREVIATIONS.get(token, token) for token in tokens if token not in NOISE_TOKENS)
+
+
+def _slug(text: str) -> str:
+    return text.replace(" ", "-")
+
+
+class LocationIndex:
+    """In-memory alias tables over the bundled gazetteer."""
+
+    def __init__(self, path: Path | str = INDEX_PATH):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.climate_zones: dict[str, str] = data["climate_zones"]
+        self.provinces: dict[str, Location] = {}
+        # alias -> province ID, and alias -> places (default first)
+        self._province_aliases: dict[str, str] = {}
+        self._place_aliases: dict[str, list[Location]] = {}
+        self._province_place_keys: dict[str, list[str]] = {}
+
+        for province_id, name, region, climate, *aliases in data["provinces"]:
+            province = Location(province_id, name, name, region, climate)
+            self.provinces[province_id] = province
+            for alias in [name, *(aliases[0] if aliases else [])]:
+                self._province_aliases.setdefault(normalize_text(alias), province_id)
+
+        for name, province_id, *aliases in data["places"]:
+            province = self.provinces[province_id]
+            key = normalize_text(name)
+            place = Location(f"{province_id}/{_slug(key)}", name, province.name, province.region, province.climate_zone)
+            names = {key, f"{key} city", f"city {key}", *(normalize_text(a) for a in (aliases[0] if aliases else []))}
+            if key.endswith(" city"):
+                # "Davao City" can be typed as "Davao", unless that names a province ("Cebu", "Iloilo")
+                bare = key[: -len(" city")]
+                if bare not in self._province_aliases:
+                    names.add(bare)
+            for alias in names:
+                self._place_aliases.setdefault(alias, []).append(place)
+            self._province_place_keys.setdefault(province_id, []).extend(sorted(names))
+
+        # Bare names several PSGC municipalities share, even where the index lists only one of them
+        self._ambiguous = {normalize_text(name) for name in data.get("ambiguous", [])}
+        self._place_keys = sorted(self._place_aliases)
+        self._fuzzy_keys = sorted(set(self._place_aliases) | set(self._province_aliases))
+
+    def _place(self, text: str, province_id: Optional[str] = None) -> Optional[Location]:
+        """Place with this alias; a name shared by several provinces needs province_id to pick one."""
+        places = self._place_aliases.get(text, [])
+        if province_id is None and text in self._ambiguous:
+            return None
+        if province_id is not None:
+            places = [p for p in places if p.id.startswith(province_id + "/")]
+        return places[0] if len(places) == 1 else None
+
+    def _fuzzy(self, text: str, keys: list[str]) -> Optional[str]:
+        # Only compare against keys sharing the first letter; typos rarely hit it
+        candidates = [key for key in keys if key[:1] == text[:1]]
+        matches = difflib.get_close_matches(text, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return matches[0] if matches else None
+
+    def _match_place(self, tokens: list[str], province_id: Optional[str] = None) -> Optional[Location]:
+        """Place named by the tokens, then by fuzzy match.
+
+        Leading tokens are only skipped past a street or barangay marker
+        ("brgy malitlit santa rosa"); "Los Angeles" is not Angeles.
+        """
+        markers = [i for i, token in enumerate(tokens) if token in ADDRESS_MARKERS]
+        starts = [0, *range(markers[-1] + 1, len(tokens))] if markers else [0]
+        for start in starts:
+            place = self._place(" ".join(tokens[start:]), province_id)
+            if place is not None:
+                return place
+        keys = self._province_place_keys.get(province_id, []) if province_id else self._place_keys
+        fuzzy = self._fuzzy(" ".join(tokens), keys)
+        return self._place(fuzzy, province_id) if fuzzy else None
+
+    def resolve(self, text: str) -> Optional[Location]:
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+        tokens = normalized.split()
+
+        if normalized in self._place_aliases:
+            return self._place(normalized)
+        if normalized in self._province_aliases:
+            return self.provinces[self._province_aliases[normalized]]
+
+        # "<place> <province>": the province picks between same-named places
+        for split in range(len(tokens) - 1, 0, -1):
+            province_id = self._province_aliases.get(" ".join(tokens[split:]))
+            if province_id is None:
+                continue
+            head = tokens[:split]
+            place = self._match_place(head, province_id)
+            if place is not None:
+                return place
+            # A town the index doesn't list still gets a stable ID and its province's climate
+            province = self.provinces[province_id]
+            name = " ".join(head)
+            return Location(f"{province_id}/{_slug(name)}", name.title(), province.name, province.region, province.climate_zone)
+
+        place = self._match_place(tokens)
+        if place is not None:
+            return place
+        fuzzy = self._fuzzy(normalized, self._fuzzy_keys)
+        if fuzzy in self._place_aliases:
+            return self._place(fuzzy)
+        if fuzzy is not None:
+            return self.provinces[self._province_aliases[fuzzy]]
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_index() -> LocationIndex:
+    return LocationIndex()
+
+
+@lru_cache(maxsize=4096)
+def resolve(text: str) -> Optional[Location]:
+    """Canonical Location for free text, or None when it isn't a known Philippine place or is ambiguous."""
+    return get_index().resolve(text)
+
+
+def location_key(text: str) -> str:
+    """Cache key for a location: its canonical ID, or the normalized text when unknown."""
+    location = resolve(text)
+    return location.id if location is not None else " ".join(text.split()).lower()
+
+
+def display_location(text: str) -> str:
+    """Canonical display name (e.g. for precompute's location list), or the text as typed when unknown."""
+    location = resolve(text)
+    return location.display_name if location is not None else text.strip()
@@ -0,0 +1,336 @@
+"""Per-kickoff instrumentation: a rolling JSONL log plus Prometheus-style metrics.
+
+Every crew kickoff (cache hits included) is recorded with its crew name,
+input size, token usage, estimated cost, wall time, retries and cache status.
+Metrics live in a small in-process registry that renders the Prometheus text
+format, served from a local endpoint when BUKID_METRICS_PORT is set.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_LOG_PATH = Path(__file__).resolve().parents[2] / ".cache" / "kickoffs.jsonl"
+DEFAULT_LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+LOOKUP_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+
+# USD per million (input, output) tokens
+MODEL_PRICING = {
+    "claude-sonnet-4-5": (3.00, 15.00),
+    "claude-sonnet-4-20250514": (3.00, 15.00),
+    "claude-haiku-4-5": (1.00, 5.00),
+    "claude-3-5-haiku-latest": (0.80, 4.00),
+}
+
+
+# ── Metric types ──────────────────────────────────────────────────
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: tuple, extra: Optional[dict] = None) -> str:
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ""
+    inner = ",".join(f'{k}="{str(v)}"' for k, v in items)
+    return "{" + inner + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            lines += [f"{self.name}{_format_labels(k)} {v}" for k, v in sorted(self._values.items())]
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram that also keeps a window of recent samples for quantiles."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS, window: int = 500):
+        super().__init__(name, help)
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._series: dict[tuple, dict] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {
+                "counts": [0] * (len(self.buckets) + 1),
+                "sum": 0.0,
+                "count": 0,
+                "recent": deque(maxlen=self.window),
+            })
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["recent"].append(value)
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Quantile over the recent window, or None with no observations."""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            samples = sorted(series["recent"]) if series else []
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series["count"] if series else 0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else bound
+                    lines.append(f"{self.name}_bucket{_format_labels(key, {'le': le})} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ── Crew kickoff metrics ──────────────────────────────────────────
+KICKOFFS = Counter("bukid_crew_kickoffs_total", "Crew kickoffs by crew, cache status and outcome")
+LATENCY = Histogram("bukid_crew_latency_seconds", "Wall time per crew call, cache hits included")
+PROMPT_TOKENS = Counter("bukid_crew_prompt_tokens_total", "Prompt tokens sent per crew")
+COMPLETION_TOKENS = Counter("bukid_crew_completion_tokens_total", "Completion tokens received per crew")
+TOKENS = Histogram("bukid_crew_tokens", "Total tokens per crew kickoff", buckets=TOKEN_BUCKETS)
+COST = Counter("bukid_crew_cost_usd_total", "Estimated LLM spend per crew in USD")
+RETRIES = Counter("bukid_crew_retries_total", "Task retries (guardrail or conversion) per crew")
+INPUT_BYTES = Counter("bukid_crew_input_bytes_total", "Size of the JSON-encoded crew inputs")
+COALESCED = Counter("bukid_crew_coalesced_total", "Calls answered by an identical kickoff already in flight")
+BUDGET_EVENTS = Counter("bukid_crew_budget_events_total", "Latency budget timeouts, first-token timeouts, hedged requests, hedges won and model fallbacks")
+
+# ── Admission control ─────────────────────────────────────────────
+ADMISSION_QUEUE = Gauge("bukid_admission_queue_depth", "Kickoffs waiting for an admission slot, by priority")
+ADMISSION_ACTIVE = Gauge("bukid_admission_active", "Kickoffs currently holding an admission slot")
+ADMISSION_WAIT = Histogram("bukid_admission_wait_seconds", "Time spent waiting for an admission slot")
+
+# ── Structured output repair ──────────────────────────────────────
+STRUCTURED_OUTPUTS = Counter("bukid_structured_outputs_total", "Structured task outputs by model and outcome (clean, repaired, reprompted)")
+RETRIES_SAVED = Counter("bukid_llm_retries_saved_total", "LLM re-format round trips avoided by repairing output locally")
+
+# ── Knowledge retrieval ───────────────────────────────────────────
+KNOWLEDGE_QUERY = Histogram("bukid_knowledge_query_seconds", "Time to rank knowledge snippets for a prompt", buckets=LOOKUP_BUCKETS)
+
+# ── Open-chat memory ──────────────────────────────────────────────
+CHAT_CONTEXT_TOKENS = Histogram("bukid_chat_context_tokens", "Tokens of conversation history sent with each chat question",
+                                buckets=(50, 100, 200, 300, 400, 500, 600, 800, 1000, 1500))
+CHAT_FOLDS = Counter("bukid_chat_folded_turns_total", "Chat turns folded into a conversation's running summary")
+
+# ── Translation ───────────────────────────────────────────────────
+TRANSLATED_TEXTS = Counter("bukid_translated_texts_total", "Free-text fields translated from the canonical language, by language and source (cache, crew)")
+
+# ── Chat replay rendering ─────────────────────────────────────────
+CHART_BUILDS = Counter("bukid_chart_builds_total", "Result figures, tables and cards built or reused from the render memo, by kind and outcome (built, hit)")
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    from bukid.llm import DEFAULT_MODEL
+
+    model = (model or DEFAULT_MODEL).split("/")[-1]
+    input_price, output_price = MODEL_PRICING.get(model, MODEL_PRICING[DEFAULT_MODEL])
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def record_kickoff(
+    crew: str,
+    inputs: dict,
+    wall_s: float,
+    cache: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    retries: int = 0,
+    model: Optional[str] = None,
+    error: Optional[str] = None,
+) -> dict:
+    """Record one crew call in the metrics registry and the rolling JSONL log."""
+    input_size = len(json.dumps(inputs, ensure_ascii=False, default=str).encode("utf-8"))
+    cost = estimate_cost(model, prompt_tokens, completion_tokens) if prompt_tokens or completion_tokens else 0.0
+    outcome = "error" if error else "ok"
+
+    KICKOFFS.inc(crew=crew, cache=cache, outcome=outcome)
+    LATENCY.observe(wall_s, crew=crew, cache=cache)
+    INPUT_BYTES.inc(input_size, crew=crew)
+    if prompt_tokens or completion_tokens:
+        PROMPT_TOKENS.inc(prompt_tokens, crew=crew)
+        COMPLETION_TOKENS.inc(completion_tokens, crew=crew)
+        TOKENS.observe(prompt_tokens + completion_tokens, crew=crew)
+        COST.inc(cost, crew=crew)
+    if retries:
+        RETRIES.inc(retries, crew=crew)
+    if cache == "coalesced":
+        COALESCED.inc(crew=crew)
+
+    record = {
+        "ts": time.time(),
+        "crew": crew,
+        "input_bytes": input_size,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": round(cost, 6),
+        "wall_s": round(wall_s, 4),
+        "retries": retries,
+        "cache": cache,
+        "model": model,
+        "outcome": outcome,
+        "error": error,
+    }
+    _kickoff_log().write(record)
+    return record
+
+
+# ── Rolling JSONL log ─────────────────────────────────────────────
+class RollingJsonlLog:
+    """Append-only JSONL file rotated to .1, .2, ... once it exceeds max_bytes."""
+
+    def __init__(self, path: Path | str, max_bytes: int = DEFAULT_LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                    self._rotate()
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                pass  # metrics must never break a user request
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+
+_log: Optional[RollingJsonlLog] = None
+_log_lock = threading.Lock()
+
+
+def _kickoff_log() -> RollingJsonlLog:
+    # Kickoffs record from executor threads; two logs would both roll the same file
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = RollingJsonlLog(
+                os.environ.get("BUKID_METRICS_LOG", DEFAULT_LOG_PATH),
+                max_bytes=int(os.environ.get("BUKID_METRICS_LOG_MAX_BYTES", DEFAULT_LOG_MAX_BYTES)),
+            )
+        return _log
+
+
+# ── Local /metrics endpoint ───────────────────────────────────────
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve REGISTRY at http://host:port/metrics once per process (port from BUKID_METRICS_PORT)."""
+    global _server
+    if port is None:
+        if not os.environ.get("BUKID_METRICS_PORT"):
+            return None
+        port = int(os.environ["BUKID_METRICS_PORT"])
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="bukid-metrics", daemon=True).start()
+        return _server
@@ -52,3 +52,15 @@ class ReplantingOutput(BaseModel):
     harvested_vegetable: str = Field(..., description="The vegetable that was just harvested")
     recommendations: List[ReplantingRecommendation]
     soil_rest_advice: str = Field(default="", description="Whether the soil needs rest before replanting")
+
+
+class PlanningBundleOutput(BaseModel):
+    """Research, schedule and preparation for the planning flow, returned by a single call"""
+    research: VegetableResearchOutput
+    schedule: VegetableScheduleOutput
+    preparation: VegetablePreparationOutput
+
+
+class TranslationOutput(BaseModel):
+    """Translations of a batch of texts, in the order they were given"""
+    translations: List[str] = Field(description="One translation per input text, in the same order")
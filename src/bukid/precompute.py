@@ -0,0 +1,161 @@
+"""Headless batch precompute of crew results for common locations.
+
+Runs research, then schedule and preparation for the recommended vegetables,
+for every location × language × planting medium combination, and leaves the
+results in the response cache that the Streamlit app reads from. Completed
+combinations are appended to a progress file, so an interrupted run picks up
+where it stopped.
+
+    precompute locations.txt --languages English Tagalog --media pots in-ground --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from bukid.admission import priority
+from bukid.cache import DEFAULT_TTL_SECONDS, cache_enabled, cache_path
+from bukid.locations import display_location, location_key
+
+
+LANGUAGES = ("English", "Tagalog")
+PLANTING_MEDIA = ("pots", "in-ground")
+DEFAULT_LOCATIONS = Path(__file__).resolve().parent / "config" / "precompute_locations.txt"
+PROGRESS_FILENAME = "precompute_progress.jsonl"
+
+
+def default_progress_path() -> Path:
+    """Progress file next to the response cache, wherever BUKID_CACHE_PATH puts it."""
+    return cache_path().parent / PROGRESS_FILENAME
+
+
+def read_locations(path: Path | str) -> list[str]:
+    """One location per line; blank lines, '#' comments and duplicates are skipped."""
+    locations = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        location = line.split("#", 1)[0].strip()
+        if location and location not in locations:
+            locations.append(location)
+    return locations
+
+
+def job_key(crew_inputs: dict) -> tuple:
+    return (crew_inputs["location"], crew_inputs["language"], crew_inputs["planting_medium"])
+
+
+class Progress:
+    """Append-only JSONL record of finished jobs, used to resume interrupted runs."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def completed(self, max_age: float = 0) -> set[tuple]:
+        """Jobs finished successfully, ignoring ones older than max_age seconds (0 keeps all)."""
+        done = set()
+        now = time.time()
+        if not self.path.exists():
+            return done
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if max_age and now - record.get("ts", 0) > max_age:
+                continue  # the cached results have expired by now
+            if record.get("status") == "ok":
+                done.add((record["location"], record["language"], record["planting_medium"]))
+        return done
+
+    def write(self, record: dict) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def build_jobs(locations: Iterable[str], languages: Iterable[str], media: Iterable[str]) -> list[dict]:
+    # previous_year must match main.py's crew_inputs, it is part of the research cache key
+    previous_year = str(datetime.now().year - 1)
+    # Spelling variants of one place share cached results, so precompute each place once
+    canonical = {}
+    for location in locations:
+        canonical.setdefault(location_key(location), display_location(location))
+    return [
+        {"location": location, "previous_year": previous_year, "language": language, "planting_medium": medium}
+        for location in canonical.values()
+        for language in languages
+        for medium in media
+    ]
+
+
+def precompute_one(crew_inputs: dict) -> dict:
+    """Run the planning flow for one combination; each step is served from the cache if already there."""
+    from bukid.crew import run_preparation, run_research, run_schedule
+
+    start = time.perf_counter()
+    # Interactive sessions sharing the process are admitted ahead of this work
+    with priority("background"):
+        research = run_research(crew_inputs)
+        if research is None:
+            raise ValueError("research crew returned no structured output")
+        # Same vegetable list main.py hands to the schedule and preparation crews
+        vegetables = "\n".join(v.vegetable for v in research.vegetable_recommendations)
+        if run_schedule(crew_inputs, vegetables) is None:
+            raise ValueError("schedule crew returned no structured output")
+        if run_preparation(crew_inputs, vegetables) is None:
+            raise ValueError("preparation crew returned no structured output")
+    return {"vegetables": len(research.vegetable_recommendations), "wall_s": round(time.perf_counter() - start, 3)}
+
+
+def run_batch(jobs: list[dict], progress: Progress, workers: int = 4, resume: bool = True) -> dict:
+    """Precompute every job with at most `workers` running at once; returns ok/failed/skipped counts."""
+    ttl = float(os.environ.get("BUKID_CACHE_TTL", DEFAULT_TTL_SECONDS))
+    done = progress.completed(max_age=ttl) if resume else set()
+    pending = [job for job in jobs if job_key(job) not in done]
+    counts = {"ok": 0, "failed": 0, "skipped": len(jobs) - len(pending)}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bukid-precompute") as pool:
+        futures = {pool.submit(precompute_one, job): job for job in pending}
+        for n, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            record = {"ts": time.time(), **{k: job[k] for k in ("location", "language", "planting_medium")}}
+            try:
+                record.update(status="ok", **future.result())
+            except Exception as e:
+                record.update(status="failed", error=repr(e))
+            counts[record["status"]] += 1
+            progress.write(record)
+            print(f"[{n}/{len(pending)}] {record['status']:<6} {' / '.join(job_key(job))}", flush=True)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("locations", type=Path, nargs="?", default=DEFAULT_LOCATIONS,
+                        help="text file with one location per line")
+    parser.add_argument("--languages", nargs="+", choices=LANGUAGES, default=list(LANGUAGES))
+    parser.add_argument("--media", nargs="+", choices=PLANTING_MEDIA, default=list(PLANTING_MEDIA))
+    parser.add_argument("--workers", type=int, default=4, help="combinations precomputed at once")
+    parser.add_argument("--progress", type=Path, default=None,
+                        help="progress file (default: next to the response cache)")
+    parser.add_argument("--fresh", action="store_true", help="ignore the progress file and redo every combination")
+    args = parser.parse_args(argv)
+
+    if not cache_enabled():
+        parser.error("BUKID_CACHE_DISABLED is set; precomputed results would be thrown away")
+
+    jobs = build_jobs(read_locations(args.locations), args.languages, args.media)
+    counts = run_batch(jobs, Progress(args.progress or default_progress_path()), workers=max(1, args.workers), resume=not args.fresh)
+    print(f"ok={counts['ok']} failed={counts['failed']} skipped={counts['skipped']}")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
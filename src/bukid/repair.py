@@ -0,0 +1,184 @@
+"""Local repair of malformed structured output before crewAI re-prompts for it.
+
+When a task's output doesn't validate against its output_pydantic model,
+crewAI hands it to a Converter that asks the LLM to re-format it: another full
+round trip, repeated up to three times. Most failures are small and mechanical,
+so RepairingConverter fixes them locally first:
+
+- code fences and prose around the JSON, trailing commas;
+- month names ("March", "Mar", "Marso") where a month number is expected,
+  and month numbers outside 1-12 (13 means January of the next year);
+- null for fields that have a default;
+- the item list returned bare, or the object wrapped in an extra key.
+
+Only output that is still invalid after repair goes back to the LLM. Repairs
+are counted in bukid_llm_retries_saved_total.
+"""
+import json
+import re
+from typing import Any, Optional, Union, get_args, get_origin
+
+from crewai.utilities.converter import Converter
+from pydantic import BaseModel
+
+from bukid import metrics
+
+
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ("january", "jan", "enero", "ene"),
+        ("february", "feb", "pebrero", "peb"),
+        ("march", "mar", "marso"),
+        ("april", "apr", "abril", "abr"),
+        ("may", "mayo"),
+        ("june", "jun", "hunyo", "hun"),
+        ("july", "jul", "hulyo", "hul"),
+        ("august", "aug", "agosto"),
+        ("september", "sep", "sept", "setyembre"),
+        ("october", "oct", "oktubre", "okt"),
+        ("november", "nov", "nobyembre", "nob"),
+        ("december", "dec", "disyembre", "dis"),
+    ), start=1)
+    for name in names
+}
+# Tagalog abbreviations that are also everyday English words ("two weeks ago",
+# "set the seedlings"), so they only count as months right next to a day number
+DATE_ONLY_MONTHS = {"ago": 8, "set": 9}
+_DAY_BEFORE = re.compile(r"(?<!\d)\d{1,2}\s*$")
+_DAY_AFTER = re.compile(r"\.?\s*\d{1,2}(?!\d)")
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+# What crewAI itself tries before re-prompting: the outermost {...}
+_OBJECT = re.compile(r"({.*})", re.DOTALL)
+# Opening brackets tried per candidate, so prose full of brackets stays cheap
+MAX_JSON_STARTS = 20
+
+
+def extract_json(text: str) -> Any:
+    """The first JSON object or array in text, ignoring code fences, prose and trailing commas."""
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    decoder = json.JSONDecoder(strict=False)
+    for candidate in (text, _TRAILING_COMMA.sub(r"\1", text)):
+        starts = [i for i, ch in enumerate(candidate) if ch in "{["][:MAX_JSON_STARTS]
+        for start in starts:
+            try:
+                return decoder.raw_decode(candidate, start)[0]
+            except json.JSONDecodeError:
+                continue
+    raise ValueError("No JSON object found in the output")
+
+
+def coerce_month(value: Any) -> Any:
+    """Month number 1-12 from a number, numeric string or month name; other values unchanged."""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if re.fullmatch(r"-?\d+", stripped):
+            value = int(stripped)
+        else:
+            lowered = stripped.lower()
+            for word in re.finditer(r"[a-z]+", lowered):
+                name = word.group()
+                if name in MONTHS:
+                    return MONTHS[name]
+                if name in DATE_ONLY_MONTHS and (_DAY_BEFORE.search(lowered, 0, word.start())
+                                                 or _DAY_AFTER.match(lowered, word.end())):
+                    return DATE_ONLY_MONTHS[name]
+            return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return (value - 1) % 12 + 1
+    return value
+
+
+def _nested_model(annotation: Any) -> tuple[Optional[type[BaseModel]], bool]:
+    """(model, is_list) for a BaseModel or List[BaseModel] field annotation, else (None, False)."""
+    is_list = False
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else annotation
+    if get_origin(annotation) is list:
+        is_list = True
+        annotation = (get_args(annotation) or (None,))[0]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, is_list
+    return None, False
+
+
+def repair(data: Any, model: type[BaseModel]) -> Any:
+    """Fix the common defects in parsed output so it has a chance to validate against model."""
+    fields = model.model_fields
+    if isinstance(data, list):
+        list_fields = [name for name, field in fields.items() if get_origin(field.annotation) is list]
+        if len(list_fields) == 1:
+            data = {list_fields[0]: data}
+    if isinstance(data, dict) and len(data) == 1:
+        (key, value), = data.items()
+        if key not in fields and isinstance(value, (dict, list)):
+            return repair(value, model)
+    if not isinstance(data, dict):
+        return data
+
+    data = dict(data)
+    for name, field in fields.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if value is None and not field.is_required():
+            del data[name]
+            continue
+        if name.endswith("_month"):
+            data[name] = coerce_month(value)
+            continue
+        nested, is_list = _nested_model(field.annotation)
+        if nested is None:
+            continue
+        if is_list:
+            if isinstance(value, dict):
+                value = [value]
+            if isinstance(value, list):
+                data[name] = [repair(item, nested) for item in value]
+        else:
+            data[name] = repair(value, nested)
+    return data
+
+
+def _validate_as_is(text: str, model: type[BaseModel]) -> Optional[BaseModel]:
+    """The model if crewAI's own parsing would have accepted text without a re-prompt."""
+    match = _OBJECT.search(text)
+    for candidate in (text, match.group() if match else None):
+        if candidate is None:
+            continue
+        try:
+            return model.model_validate(json.loads(candidate, strict=False))
+        except ValueError:
+            continue
+    return None
+
+
+def parse_structured(text: str, model: type[BaseModel]) -> tuple[BaseModel, bool]:
+    """(instance, repaired) parsed from text; raises ValueError when even a repair doesn't validate."""
+    parsed = _validate_as_is(text, model)
+    if parsed is not None:
+        return parsed, False
+    return model.model_validate(repair(extract_json(text), model)), True
+
+
+class RepairingConverter(Converter):
+    """Converter that repairs output locally and only asks the LLM to re-format what it can't fix."""
+
+    def to_pydantic(self, current_attempt: int = 1) -> BaseModel:
+        name = self.model.__name__
+        try:
+            result, repaired = parse_structured(self.text, self.model)
+        except ValueError:
+            metrics.STRUCTURED_OUTPUTS.inc(model=name, outcome="reprompted")
+            return super().to_pydantic(current_attempt)
+        if repaired:
+            metrics.RETRIES_SAVED.inc(model=name)
+        metrics.STRUCTURED_OUTPUTS.inc(model=name, outcome="repaired" if repaired else "clean")
+        return result
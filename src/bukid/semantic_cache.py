@@ -0,0 +1,300 @@
+"""Similarity-based answer cache for open-chat questions.
+
+"How often should I water tomatoes in pots?" and "how frequently do I water
+my potted tomatoes" deserve the same answer. Past answers are indexed by the
+TF-IDF vector of their question within a scope (location, planting medium,
+language) and question type; a new question whose cosine similarity to an
+indexed one clears the threshold is answered from the index without a qa_crew
+kickoff. The question type keeps "When should I plant tomatoes?" from being
+answered with "Why do I plant tomatoes?": they share every content word.
+
+Everything runs locally: the index is an in-memory inverted index over at most
+max_entries questions (least recently used evicted first), persisted to a
+table in the response cache's SQLite file.
+"""
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from bukid.cache import DEFAULT_CACHE_PATH, DEFAULT_TTL_SECONDS, cache_path
+from bukid.locations import location_key
+
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_MAX_ENTRIES = 2000
+# Only this many best-overlapping questions are scored per lookup, bounding latency
+MAX_CANDIDATES = 64
+
+# English and Tagalog function words that say nothing about the question's topic
+STOPWORDS = frozenset("""
+a an and are as at be can could do does for from have how i if in into is it its me my of on or should
+so than that the their them there these they this to was we what when where which who why will with would
+you your yours pa po ba na ng sa mga ang ay ko ako ka kayo ikaw ninyo namin natin ito iyan iyon yung yong
+para paano kailan ano saan bakit lang din rin nga naman at o kung dapat pwede puwede ba't
+""".split())
+
+
+# Question words, English and Tagalog, and the question type they ask. Question
+# words are stopwords for the TF-IDF vector but must agree before a hit counts.
+QUESTION_WORDS = {
+    "how": "how", "paano": "how",
+    "what": "what", "ano": "what",
+    "when": "when", "kailan": "when",
+    "where": "where", "saan": "where",
+    "why": "why", "bakit": "why",
+    "which": "which", "alin": "which",
+    "who": "who", "sino": "who",
+}
+# Yes/no questions go by their auxiliary, when no question word leads
+AUXILIARY_WORDS = {
+    "can": "can", "could": "can", "pwede": "can", "puwede": "can", "maaari": "can",
+    "should": "should", "dapat": "should",
+    "do": "do", "does": "do", "is": "do", "are": "do",
+}
+
+
+def _words(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def question_type(text: str) -> str:
+    """'When should I plant tomatoes?' -> 'when'; 'Can I plant tomatoes?' -> 'can'."""
+    words = _words(text)
+    for word in words:
+        if word in QUESTION_WORDS:
+            return QUESTION_WORDS[word]
+    for word in words:
+        if word in AUXILIARY_WORDS:
+            return AUXILIARY_WORDS[word]
+    return ""
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, accent-free content words with plural/-ing endings trimmed."""
+    tokens = []
+    for word in _words(text):
+        if word in STOPWORDS:
+            continue
+        for suffix in ("ing", "es", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[: -len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+
+def qa_scope(inputs: dict) -> str:
+    """Answers are shared within a location, planting medium and language.
+
+    Answers name towns, markets and local conditions, so they are keyed on the
+    canonical location rather than shared across its climate zone.
+    """
+    return "|".join((
+        location_key(inputs["location"]),
+        " ".join(inputs["planting_medium"].split()).lower(),
+        inputs["language"].lower(),
+    ))
+
+
+def _typed_scope(scope: str, question: str) -> str:
+    """Only questions of the same type are compared with each other."""
+    return f"{scope}|{question_type(question)}"
+
+
+class SemanticAnswerIndex:
+    """Bounded TF-IDF nearest-neighbour index of (scope, question) -> answer."""
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # id -> (scope, term counts, answer, created_at, accessed_at)
+        self._entries: dict[int, list] = {}
+        self._postings: dict[tuple[str, str], set[int]] = {}
+        self._scope_sizes: Counter = Counter()
+
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS qa_answers (
+                id          INTEGER PRIMARY KEY,
+                scope       TEXT NOT NULL,
+                question    TEXT NOT NULL,
+                answer      TEXT NOT NULL,
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM qa_answers WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT id, scope, question, answer, created_at, accessed_at FROM qa_answers "
+            "ORDER BY accessed_at DESC LIMIT ?",
+            (self.max_entries or -1,),
+        ).fetchall()
+        for entry_id, scope, question, answer, created_at, accessed_at in rows:
+            self._index(entry_id, scope, question, answer, created_at, accessed_at)
+
+    def _index(self, entry_id: int, scope: str, question: str, answer: str, created_at: float, accessed_at: float) -> None:
+        terms = Counter(tokenize(question))
+        self._entries[entry_id] = [scope, terms, answer, created_at, accessed_at]
+        self._scope_sizes[scope] += 1
+        for term in terms:
+            self._postings.setdefault((scope, term), set()).add(entry_id)
+
+    def _unindex(self, entry_id: int) -> None:
+        scope, terms, *_ = self._entries.pop(entry_id)
+        self._scope_sizes[scope] -= 1
+        for term in terms:
+            posting = self._postings[(scope, term)]
+            posting.discard(entry_id)
+            if not posting:
+                del self._postings[(scope, term)]
+
+    def _vector(self, terms: Counter, idf: dict[str, float]) -> dict[str, float]:
+        vector = {term: count * idf[term] for term, count in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {term: w / norm for term, w in vector.items()}
+
+    # ── Lookups ───────────────────────────────────────────────────
+    def lookup(self, scope: str, question: str) -> Optional[tuple[str, float]]:
+        """Best indexed answer and its similarity, or None when nothing clears the threshold."""
+        terms = Counter(tokenize(question))
+        scope = _typed_scope(scope, question)
+        now = time.time()
+        with self._lock:
+            # Candidates share at least half of the question's terms; a closer
+            # match than that can't clear any useful threshold
+            overlap = Counter()
+            for term in terms:
+                overlap.update(self._postings.get((scope, term), ()))
+            candidates = [entry_id for entry_id, shared in overlap.most_common(MAX_CANDIDATES) if shared * 2 >= len(terms)]
+
+            # Smoothed IDF over the scope, as in scikit-learn's TfidfVectorizer
+            n = self._scope_sizes[scope]
+            idf = {}
+            for entry_terms in [terms] + [self._entries[entry_id][1] for entry_id in candidates]:
+                for term in entry_terms:
+                    if term not in idf:
+                        idf[term] = math.log((1 + n) / (1 + len(self._postings.get((scope, term), ())))) + 1
+
+            query = self._vector(terms, idf)
+            best_id, best_score = None, 0.0
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if self.ttl_seconds and now - entry[3] > self.ttl_seconds:
+                    continue
+                vector = self._vector(entry[1], idf)
+                score = sum(w * vector.get(term, 0.0) for term, w in query.items())
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            entry = self._entries[best_id]
+            entry[4] = now
+            self._conn.execute("UPDATE qa_answers SET accessed_at = ? WHERE id = ?", (now, best_id))
+            self._conn.commit()
+            self.hits += 1
+            return entry[2], best_score
+
+    def add(self, scope: str, question: str, answer: str) -> None:
+        if not tokenize(question) or not answer:
+            return
+        scope = _typed_scope(scope, question)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO qa_answers (scope, question, answer, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (scope, question, answer, now, now),
+            )
+            self._index(cursor.lastrowid, scope, question, answer, now, now)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries above max_entries (caller holds the lock)."""
+        overflow = len(self._entries) - self.max_entries if self.max_entries else 0
+        if overflow <= 0:
+            return
+        oldest = sorted(self._entries, key=lambda entry_id: self._entries[entry_id][4])[:overflow]
+        for entry_id in oldest:
+            self._unindex(entry_id)
+        self._conn.executemany("DELETE FROM qa_answers WHERE id = ?", [(entry_id,) for entry_id in oldest])
+        self.evictions += overflow
+
+    # ── Maintenance ───────────────────────────────────────────────
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._scope_sizes.clear()
+            self._conn.execute("DELETE FROM qa_answers")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+_index: Optional[SemanticAnswerIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_answer_index() -> SemanticAnswerIndex:
+    """Process-wide index, configured from BUKID_CACHE_* and BUKID_QA_* environment variables."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SemanticAnswerIndex(
+                path=cache_path(),
+                threshold=float(os.environ.get("BUKID_QA_SIMILARITY", DEFAULT_THRESHOLD)),
+                max_entries=int(os.environ.get("BUKID_QA_INDEX_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                ttl_seconds=float(os.environ.get("BUKID_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+            )
+        return _index
+
+
+def semantic_cache_enabled() -> bool:
+    return os.environ.get("BUKID_QA_SEMANTIC_DISABLED", "").lower() not in ("1", "true", "yes")
@@ -0,0 +1,125 @@
+"""Free-text translation of structured crew results.
+
+Structured results for the same town differ between languages only in their
+free-text fields; vegetable names and schedule months are the same. They are
+generated and cached once in CANONICAL_LANGUAGE, and another language gets a
+copy with just the TRANSLATABLE_FIELDS translated. Translations are cached
+per text (by hash), so a string already translated for one result isn't sent
+again for the next.
+"""
+import hashlib
+import os
+from typing import Any, Callable, Optional, get_args, get_origin
+
+from pydantic import BaseModel
+
+from bukid import metrics
+from bukid.cache import cache_enabled, get_cache
+from bukid.models.models import (
+    PlanningBundleOutput, ReplantingOutput, VegetablePreparationOutput, VegetableResearchOutput,
+    VegetableScheduleOutput,
+)
+
+
+CANONICAL_LANGUAGE = "English"
+NAMESPACE = "translation"
+
+# Vegetable names are left alone: they key the per-vegetable caches and are
+# matched against what the user picked
+UNTRANSLATED_FIELDS = frozenset({"vegetable", "harvested_vegetable"})
+
+
+def _text_fields(*models: type[BaseModel]) -> frozenset[str]:
+    """str fields of models and the models nested in them, except names, ids and dates."""
+    fields = set()
+    for model in models:
+        for name, field in model.model_fields.items():
+            annotation = field.annotation
+            if get_origin(annotation) is list:
+                annotation = (get_args(annotation) or (None,))[0]
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                fields |= _text_fields(annotation)
+            elif (field.annotation is str and name not in UNTRANSLATED_FIELDS
+                  and not name.endswith(("_id", "_date"))):
+                fields.add(name)
+    return frozenset(fields)
+
+
+# Derived from the result models, so a prose field added to one is translated too
+TRANSLATABLE_FIELDS = _text_fields(
+    VegetableResearchOutput, VegetableScheduleOutput, VegetablePreparationOutput,
+    ReplantingOutput, PlanningBundleOutput,
+)
+
+
+def translation_enabled() -> bool:
+    return os.environ.get("BUKID_TRANSLATION_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def is_canonical(language: str) -> bool:
+    return language.strip().lower() == CANONICAL_LANGUAGE.lower()
+
+
+def map_texts(value: Any, fn: Callable[[str], str]) -> Any:
+    """Copy of value with fn applied to every translatable field, at any depth."""
+    if isinstance(value, list):
+        return [map_texts(item, fn) for item in value]
+    if not isinstance(value, BaseModel):
+        return value
+    updates = {}
+    for name in type(value).model_fields:
+        field_value = getattr(value, name)
+        if name in TRANSLATABLE_FIELDS and isinstance(field_value, str):
+            updates[name] = fn(field_value) if field_value.strip() else field_value
+        elif isinstance(field_value, (BaseModel, list)):
+            updates[name] = map_texts(field_value, fn)
+    return value.model_copy(update=updates)
+
+
+def collect_texts(value: Any) -> list[str]:
+    """Distinct non-empty translatable texts in value, in document order."""
+    texts: dict[str, None] = {}
+
+    def remember(text: str) -> str:
+        texts[text] = None
+        return text
+
+    map_texts(value, remember)
+    return list(texts)
+
+
+def _cache_inputs(text: str, language: str) -> dict:
+    return {"language": language, "text": hashlib.sha256(text.encode("utf-8")).hexdigest()}
+
+
+def translate_output(
+    value: BaseModel,
+    language: str,
+    translate: Callable[[list[str], str], Optional[list[str]]],
+) -> Optional[BaseModel]:
+    """value with its free text in language, or None if translate() didn't return one text per input.
+
+    translate(texts, language) is only called for texts not translated before.
+    """
+    cache = get_cache() if cache_enabled() else None
+    translations = {}
+    missing = []
+    for text in collect_texts(value):
+        cached = cache.get(NAMESPACE, _cache_inputs(text, language)) if cache is not None else None
+        if cached is not None:
+            translations[text] = cached
+        else:
+            missing.append(text)
+
+    if missing:
+        translated = translate(missing, language)
+        if translated is None or len(translated) != len(missing):
+            return None
+        for text, translation in zip(missing, translated):
+            translations[text] = translation
+            if cache is not None:
+                cache.set(NAMESPACE, _cache_inputs(text, language), translation)
+
+    metrics.TRANSLATED_TEXTS.inc(len(translations) - len(missing), language=language, source="cache")
+    metrics.TRANSLATED_TEXTS.inc(len(missing), language=language, source="crew")
+    return map_texts(value, lambda text: translations.get(text, text))
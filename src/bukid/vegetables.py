@@ -0,0 +1,77 @@
+"""Helpers for working with the free-text vegetable list kept in session state."""
+import re
+from typing import Iterable, Sequence, TypeVar
+
+ItemT = TypeVar("ItemT")
+
+# main.py appends user additions to the research list with this prefix
+ADDITIONAL_PREFIX = "additional vegetables requested by user:"
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+# Split on commas that are not inside parentheses, e.g. keep "Pepper (chili, bell)" whole
+_COMMA_OUTSIDE_PARENS = re.compile(r",(?![^()]*\))")
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def split_vegetables(vegetables: str) -> list[str]:
+    """Turn the vegetables string (newline or comma separated, with user additions) into unique names."""
+    names: list[str] = []
+    seen: set[str] = set()
+    for line in vegetables.splitlines():
+        line = line.strip()
+        if line.lower().startswith(ADDITIONAL_PREFIX):
+            line = line[len(ADDITIONAL_PREFIX):]
+        for part in _COMMA_OUTSIDE_PARENS.split(line):
+            name = _LIST_MARKER.sub("", part).strip()
+            if name and normalize_name(name) not in seen:
+                seen.add(normalize_name(name))
+                names.append(name)
+    return names
+
+
+def _base_name(name: str) -> str:
+    """'Kangkong (Water Spinach)' -> 'kangkong'"""
+    return normalize_name(name.split("(")[0])
+
+
+def _words(name: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", name)
+
+
+def _contains_words(outer: str, inner: str) -> bool:
+    """Whether inner's words appear as a run of whole words in outer: 'bean' is in 'string bean', not 'soybean'."""
+    outer_words, inner_words = _words(outer), _words(inner)
+    size = len(inner_words)
+    return size > 0 and any(outer_words[i:i + size] == inner_words for i in range(len(outer_words) - size + 1))
+
+
+def match_items(names: Sequence[str], items: Iterable[ItemT]) -> tuple[dict[str, ItemT], list[ItemT]]:
+    """Pair requested vegetable names with the items an LLM returned for them.
+
+    Models often rename crops ("Kangkong" comes back as "Kangkong (Water
+    Spinach)"), so items are matched by exact name, then by base name or
+    one name containing the other as whole words. Items are never paired by position: callers cache matches
+    under the requested name, and an item for another crop stored there
+    would be served for days. Returns the matches and any items that could
+    not be paired.
+    """
+    items = list(items)
+    matched: dict[str, ItemT] = {}
+    unmatched = list(items)
+
+    def claim(name: str, predicate) -> None:
+        for item in unmatched:
+            if predicate(normalize_name(name), normalize_name(item.vegetable)):
+                matched[name] = item
+                unmatched.remove(item)
+                return
+
+    for name in names:
+        claim(name, lambda a, b: a == b)
+    for name in names:
+        if name not in matched:
+            claim(name, lambda a, b: _base_name(a) == _base_name(b) or _contains_words(a, b) or _contains_words(b, a))
+    return matched, unmatched